@@ -0,0 +1,53 @@
+# Helpers shared by the benchmark scripts: percentiles and the
+# --output/--compare/--threshold baseline handling.
+import json
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+def regressed(old, new, threshold):
+    return old is not None and old > 0 and new > old * (1.0 + threshold)
+
+def compare_results(current, previous, metrics, threshold):
+    # current/previous map a scenario name to its metrics; scenarios the
+    # baseline does not have are skipped
+    regressions = []
+    for name, values in current.items():
+        baseline = previous.get(name)
+        if not baseline:
+            continue
+        for metric in metrics:
+            old = baseline.get(metric, 0.0)
+            new = values.get(metric, 0.0)
+            if regressed(old, new, threshold):
+                regressions.append((name, metric, old, new))
+    return regressions
+
+def add_baseline_args(parser):
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--compare", metavar="BASELINE", help="compare against a saved baseline")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="relative slowdown that counts as a regression (default 0.15)")
+
+def finish(report, args, compare):
+    # Writes and checks the report as asked on the command line; returns
+    # the exit status, 1 if compare(report, baseline, threshold) found
+    # regressions
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=4)
+        print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        for name, metric, old, new in regressions:
+            print(f"REGRESSION {name} {metric}: {old:.1f} -> {new:.1f} ({(new / old - 1) * 100:+.1f}%)")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold * 100:.0f}%")
+    return 0
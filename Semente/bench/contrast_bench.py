@@ -0,0 +1,188 @@
+# Adaptive-contrast benchmark on synthetic backgrounds, no display needed.
+#
+#   python bench/contrast_bench.py --output bench/contrast_baseline.json
+#   python bench/contrast_bench.py --compare bench/contrast_baseline.json --threshold 0.15
+#   python bench/contrast_bench.py --no-numpy
+#
+# For each background it prints the color picked for the default #7F00FF
+# crosshair and the cost of one sample, and checks that the sampling rate
+# cap keeps the mode inside its CPU budget. The overlay scenario feeds the
+# same images to a real OverlayWindow through AdaptiveContrast.grab.
+import argparse
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+
+# Run headless unless the caller picked a platform explicitly
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtCore import QRect
+from PyQt5.QtGui import QColor, QImage, QPainter
+from PyQt5.QtWidgets import QApplication
+
+from bench._common import add_baseline_args, compare_results, finish, percentile
+from config.config_manager import CONTRAST_DEFAULTS, ConfigManager
+from ui import adaptive_contrast
+from ui.adaptive_contrast import ContrastPicker
+from ui.overlay_window import OverlayWindow
+
+PREFERRED = "#7F00FF"
+COMPARED_METRICS = ("p50_us", "p99_us")
+
+def solid(color):
+    return lambda size: filled(size, color)
+
+def filled(size, color):
+    image = QImage(size, size, QImage.Format_RGB32)
+    image.fill(QColor(color))
+    return image
+
+def split(size):
+    image = filled(size, "#F0F0F0")
+    painter = QPainter(image)
+    painter.fillRect(0, size // 2, size, size - size // 2, QColor("#101010"))
+    painter.end()
+    return image
+
+def gradient(size):
+    image = QImage(size, size, QImage.Format_RGB32)
+    painter = QPainter(image)
+    for x in range(size):
+        value = int(255 * x / max(1, size - 1))
+        painter.fillRect(x, 0, 1, size, QColor(value, value, value))
+    painter.end()
+    return image
+
+def noise(size):
+    rng = random.Random(7)
+    image = QImage(size, size, QImage.Format_RGB32)
+    for y in range(size):
+        for x in range(size):
+            image.setPixel(x, y, rng.getrandbits(24) | 0xFF000000)
+    return image
+
+BACKGROUNDS = {
+    "white": solid("#FFFFFF"),
+    "black": solid("#000000"),
+    "purple": solid("#7A10F0"),
+    "sky": solid("#9CC8F0"),
+    "foliage": solid("#2E5A1E"),
+    "split": split,
+    "gradient": gradient,
+    "noise": noise
+}
+
+def hole_rect(size, margin):
+    return QRect(margin, margin, size - 2 * margin, size - 2 * margin)
+
+def run_backgrounds(args):
+    results = {}
+    hole = hole_rect(args.sample_px, CONTRAST_DEFAULTS["margin_px"])
+    for name, make in BACKGROUNDS.items():
+        image = make(args.sample_px)
+        picker = ContrastPicker({})
+        wall = []
+        cpu = []
+        for _ in range(args.samples):
+            picker.color = None
+            started = time.perf_counter_ns()
+            cpu_started = time.thread_time_ns()
+            picker.update(PREFERRED, image, hole)
+            cpu.append((time.thread_time_ns() - cpu_started) / 1000.0)
+            wall.append((time.perf_counter_ns() - started) / 1000.0)
+        wall.sort()
+        cpu.sort()
+        results[name] = {
+            "color": picker.color or PREFERRED,
+            "p50_us": percentile(wall, 0.50),
+            "p99_us": percentile(wall, 0.99),
+            "cpu_p50_us": percentile(cpu, 0.50)
+        }
+        print(
+            f"{name:10s} color={results[name]['color']} p50={results[name]['p50_us']:8.1f}us "
+            f"p99={results[name]['p99_us']:8.1f}us"
+        )
+    return results
+
+def run_flicker(args):
+    # Alternating near-identical backgrounds should not flip the color
+    picker = ContrastPicker({})
+    hole = hole_rect(args.sample_px, CONTRAST_DEFAULTS["margin_px"])
+    images = [filled(args.sample_px, "#C8C8C8"), filled(args.sample_px, "#B4B4B4")]
+    changes = sum(picker.update(PREFERRED, images[i % 2], hole) for i in range(args.samples))
+    print(f"flicker    changes={changes} over {args.samples} samples")
+    return {"samples": args.samples, "changes": changes}
+
+def run_overlay(args):
+    with tempfile.TemporaryDirectory() as directory:
+        config = ConfigManager(config_path=os.path.join(directory, "settings.json"), write_behind=False)
+        config.set_setting("adaptive_contrast", {**CONTRAST_DEFAULTS, "enabled": True})
+        overlay = OverlayWindow(config)
+        overlay.apply_contrast_settings()
+        current = {"image": None}
+        overlay.contrast.grab = lambda rect: current["image"].scaled(rect.width(), rect.height())
+        picked = {}
+        for name in ("white", "purple", "black"):
+            current["image"] = BACKGROUNDS[name](args.sample_px)
+            overlay.contrast.tick()
+            picked[name] = QColor.fromRgba(overlay.spec.base.color).name().upper()
+        config.close()
+        overlay.deleteLater()
+    print(f"overlay    {' '.join(f'{name}={color}' for name, color in picked.items())}")
+    return picked
+
+def budget_check(results):
+    # CPU share when sampling at the rate cap, as a percentage of one core
+    worst_us = max(result["cpu_p50_us"] for result in results.values())
+    share = worst_us / 1e6 * CONTRAST_DEFAULTS["rate_hz"] * 100.0
+    within = share <= CONTRAST_DEFAULTS["cpu_budget_pct"]
+    print(
+        f"budget     worst={worst_us:.1f}us x {CONTRAST_DEFAULTS['rate_hz']}Hz = {share:.3f}% "
+        f"of {CONTRAST_DEFAULTS['cpu_budget_pct']}% ({'ok' if within else 'interval will stretch'})"
+    )
+    return {"worst_cpu_us": worst_us, "cpu_pct_at_rate_cap": share, "within_budget": within}
+
+def run_benchmarks(args):
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    if args.no_numpy:
+        adaptive_contrast.numpy = None
+    backgrounds = run_backgrounds(args)
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "qpa": os.environ.get("QT_QPA_PLATFORM"),
+            "numpy": adaptive_contrast.numpy is not None,
+            "sample_px": args.sample_px,
+            "samples": args.samples
+        },
+        "results": backgrounds,
+        "budget": budget_check(backgrounds),
+        "flicker": run_flicker(args),
+        "overlay": run_overlay(args)
+    }
+    app.processEvents()
+    return report
+
+def compare(report, baseline, threshold):
+    return compare_results(report["results"], baseline.get("results", {}), COMPARED_METRICS, threshold)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Adaptive-contrast benchmark on synthetic backgrounds")
+    add_baseline_args(parser)
+    parser.add_argument("--samples", type=int, default=200, help="samples per background")
+    parser.add_argument("--sample-px", type=int, default=96,
+                        help="side of the sampled region, crosshair plus both margins")
+    parser.add_argument("--no-numpy", action="store_true", help="measure the pure-Python fallback")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    return finish(run_benchmarks(args), args, compare)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,190 @@
+# Headless crosshair painting benchmark.
+#
+#   python bench/render_bench.py --output bench/baseline.json
+#   python bench/render_bench.py --compare bench/baseline.json --threshold 0.15
+#
+# Allocation figures cover the Python heap only (tracemalloc); native Qt
+# allocations show up in peak RSS instead.
+import argparse
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Run headless unless the caller picked a platform explicitly
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QColor, QImage
+from PyQt5.QtWidgets import QApplication
+
+from bench._common import add_baseline_args, compare_results, finish, percentile, regressed
+from config.config_manager import ConfigManager
+from ui import crosshair_renderer
+from ui.crosshair_cache import crosshair_cache
+from ui.crosshair_renderer import CROSSHAIR_TYPES
+from ui.main_window import CrosshairPreview
+from ui.overlay_window import OverlayWindow
+from utils.process_stats import peak_rss_bytes
+
+STYLES = {
+    "plain": {},
+    "composite": {"gap": 4, "dot": True, "outline": True}
+}
+COMPARED_METRICS = ("p50_us", "p99_us", "alloc_peak_bytes_per_frame")
+
+def frange(start, stop, step):
+    values = []
+    value = start
+    while value <= stop + 1e-9:
+        values.append(round(value, 3))
+        value += step
+    return values
+
+def iter_variants(args):
+    for style in args.styles:
+        for crosshair_type in CROSSHAIR_TYPES:
+            for thickness in range(1, 11, args.thickness_step):
+                for size in range(5, 101, args.size_step):
+                    for opacity in frange(0.1, 1.0, args.opacity_step):
+                        yield {
+                            **STYLES[style],
+                            "type": crosshair_type,
+                            "color": "#7F00FF",
+                            "thickness": thickness,
+                            "size": size,
+                            "opacity": opacity
+                        }
+
+def apply_to_preview(preview, crosshair):
+    preview.style_options = {k: v for k, v in crosshair.items() if k in STYLES["composite"]}
+    preview.crosshair_type = crosshair["type"]
+    preview.color = QColor(crosshair["color"])
+    preview.thickness = crosshair["thickness"]
+    preview.size = crosshair["size"]
+    preview.set_opacity(crosshair["opacity"])
+
+def apply_to_overlay(overlay, crosshair):
+    overlay.update_crosshair({"gap": 0, "dot": False, "outline": False, **crosshair})
+
+def run_scenario(widget, apply, args, cold):
+    target = None
+    frame_times = []
+    alloc_peaks = []
+    alloc_blocks = []
+
+    for crosshair in iter_variants(args):
+        apply(widget, crosshair)
+        # The overlay resizes to each crosshair's extent
+        if target is None or target.size() != widget.size():
+            target = QImage(widget.size(), QImage.Format_ARGB32_Premultiplied)
+        for _ in range(args.frames):
+            if cold:
+                crosshair_cache.clear()
+                crosshair_renderer._compiled.clear()
+            target.fill(Qt.transparent)
+            start = time.perf_counter_ns()
+            widget.render(target)
+            frame_times.append((time.perf_counter_ns() - start) / 1000.0)
+
+        # Allocation pass, kept apart from timing because tracing is slow
+        if cold:
+            crosshair_cache.clear()
+            crosshair_renderer._compiled.clear()
+        tracemalloc.reset_peak()
+        before_current, _ = tracemalloc.get_traced_memory()
+        before_blocks = sys.getallocatedblocks()
+        widget.render(target)
+        current, peak = tracemalloc.get_traced_memory()
+        alloc_peaks.append(max(0, peak - before_current))
+        alloc_blocks.append(sys.getallocatedblocks() - before_blocks)
+
+    frame_times.sort()
+    return {
+        "frames": len(frame_times),
+        "mean_us": sum(frame_times) / len(frame_times) if frame_times else 0.0,
+        "p50_us": percentile(frame_times, 0.50),
+        "p90_us": percentile(frame_times, 0.90),
+        "p99_us": percentile(frame_times, 0.99),
+        "max_us": frame_times[-1] if frame_times else 0.0,
+        "alloc_peak_bytes_per_frame": sum(alloc_peaks) / len(alloc_peaks) if alloc_peaks else 0.0,
+        "alloc_blocks_per_frame": sum(alloc_blocks) / len(alloc_blocks) if alloc_blocks else 0.0
+    }
+
+def run_benchmarks(args):
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    with tempfile.TemporaryDirectory() as directory:
+        # Saved synchronously, so no writer thread competes with the timed loop
+        config = ConfigManager(config_path=os.path.join(directory, "settings.json"), write_behind=False)
+        results = run_widgets(args, config)
+        config.close()
+    app.processEvents()
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "qpa": os.environ.get("QT_QPA_PLATFORM"),
+            "frames_per_variant": args.frames,
+            "styles": args.styles,
+            "cache": crosshair_cache.stats()
+        },
+        "peak_rss_bytes": peak_rss_bytes(),
+        "results": results
+    }
+
+def run_widgets(args, config):
+    overlay = OverlayWindow(config)
+    preview = CrosshairPreview()
+    preview.resize(200, 200)
+    widgets = {
+        "overlay": (overlay, apply_to_overlay),
+        "preview": (preview, apply_to_preview)
+    }
+
+    tracemalloc.start()
+    results = {}
+    for name in args.widgets:
+        widget, apply = widgets[name]
+        for cold in (False, True):
+            scenario = f"{name}_{'cold' if cold else 'warm'}"
+            results[scenario] = run_scenario(widget, apply, args, cold)
+            print(
+                f"{scenario:14s} frames={results[scenario]['frames']:6d} "
+                f"p50={results[scenario]['p50_us']:8.1f}us "
+                f"p99={results[scenario]['p99_us']:8.1f}us "
+                f"alloc={results[scenario]['alloc_peak_bytes_per_frame']:8.0f}B/frame"
+            )
+    tracemalloc.stop()
+    overlay.deleteLater()
+    preview.deleteLater()
+    return results
+
+def compare(report, baseline, threshold):
+    regressions = compare_results(report["results"], baseline.get("results", {}), COMPARED_METRICS, threshold)
+    old_rss = baseline.get("peak_rss_bytes")
+    new_rss = report.get("peak_rss_bytes")
+    if new_rss and regressed(old_rss, new_rss, threshold):
+        regressions.append(("process", "peak_rss_bytes", old_rss, new_rss))
+    return regressions
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Headless crosshair painting benchmark")
+    add_baseline_args(parser)
+    parser.add_argument("--frames", type=int, default=3, help="frames rendered per variant")
+    parser.add_argument("--widgets", nargs="+", choices=("overlay", "preview"), default=["overlay", "preview"])
+    parser.add_argument("--styles", nargs="+", choices=tuple(STYLES), default=list(STYLES))
+    parser.add_argument("--thickness-step", type=int, default=1)
+    parser.add_argument("--size-step", type=int, default=5)
+    parser.add_argument("--opacity-step", type=float, default=0.1)
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    return finish(run_benchmarks(args), args, compare)
+
+if __name__ == "__main__":
+    sys.exit(main())
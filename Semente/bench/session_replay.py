@@ -0,0 +1,394 @@
+# Headless replay of a recorded editor session.
+#
+#   python main.py --record-session session.json        (then use the editor)
+#   python bench/session_replay.py session.json --output bench/replay_baseline.json
+#   python bench/session_replay.py session.json --compare bench/replay_baseline.json
+#
+# Without a session file a built-in synthetic session is replayed. Each
+# event goes through the same handlers the editor and hotkeys use, and its
+# latency runs until the overlay has painted the result (or, for edits
+# that paint nothing, until the handler returned). Settings and profiles
+# are copied into a temporary directory so the real ones are never written.
+import argparse
+import json
+import logging
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+# Run headless unless the caller picked a platform explicitly
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from PyQt5.QtCore import QEvent, QEventLoop, QObject, Qt, QTimer
+from PyQt5.QtWidgets import QApplication
+
+from bench._common import add_baseline_args, compare_results, finish, percentile, regressed
+from config.config_manager import ConfigManager
+from config.profile_store import ProfileStore
+from hotkey.backends import FakeBackend
+from hotkey.hotkey_manager import HotkeyManager
+from ui.overlay_manager import OverlayManager
+from ui.session_recorder import SESSION_VERSION
+from ui.window_host import MainWindowHost
+from utils.logger import setup_logger, shutdown_logging
+from utils.metrics import metrics
+from utils.process_stats import peak_rss_bytes
+
+HEARTBEAT_MS = 1
+COMPARED_METRICS = ("p50_ms", "p99_ms")
+
+def synthetic_session():
+    # A short tuning session: slider drags, a few color picks and toggles.
+    # The overlay starts shown, so every edit is measured against a
+    # visible overlay.
+    events = []
+    t = 0.0
+    def add(kind, **data):
+        events.append({"t_ms": round(t, 3), "kind": kind, **data})
+    for size in list(range(20, 61, 2)) + list(range(60, 29, -3)):
+        t += 16.0
+        add("field", field="size", value=size)
+    t += 400.0
+    for opacity in range(100, 49, -5):
+        t += 16.0
+        add("field", field="opacity", value=opacity / 100.0)
+    for color in ("#FF0000", "#00FF00", "#00FFFF", "#FFFFFF"):
+        t += 600.0
+        add("field", field="color", value=color)
+    for crosshair_type in ("Cross", "Circle", "Square", "Cross"):
+        t += 300.0
+        add("field", field="type", value=crosshair_type)
+    for thickness in range(1, 8):
+        t += 16.0
+        add("field", field="thickness", value=thickness)
+    # Hide and show again, ending visible like it started
+    for _ in range(2):
+        t += 500.0
+        add("action", action="toggle", argument=None, pressed=True)
+    t += 500.0
+    add("field", field="size", value=24)
+    return {"version": SESSION_VERSION, "events": events}
+
+def load_session(path):
+    if path is None:
+        return synthetic_session()
+    with open(path) as f:
+        session = json.load(f)
+    if session.get("version") != SESSION_VERSION:
+        raise ValueError(f"Unsupported session version {session.get('version')} in {path}")
+    return session
+
+def schedule(events, speed, max_gap_ms):
+    # Replay times in ms from the start; long pauses are shortened to
+    # max_gap_ms so idle time in a recording does not dominate the run.
+    times = []
+    previous = None
+    now = 0.0
+    for event in events:
+        if previous is not None:
+            now += min(max_gap_ms, max(0.0, event["t_ms"] - previous)) / speed
+        previous = event["t_ms"]
+        times.append(now)
+    return times
+
+def describe(event):
+    if event["kind"] == "field":
+        return f"{event['field']}={event['value']}"
+    if event["kind"] == "action":
+        return f"{event['action']}{'' if event.get('pressed', True) else ' release'}"
+    return event.get("name", "")
+
+class PaintProbe(QObject):
+    # Marks the events waiting for a frame as done once an overlay paint
+    # has finished; the zero-delay timer runs after paintEvent returned.
+    def __init__(self, replayer):
+        super().__init__()
+        self.replayer = replayer
+
+    def eventFilter(self, watched, event):
+        if event.type() == QEvent.Paint and self.replayer.waiting:
+            painted_before = time.perf_counter()
+            QTimer.singleShot(0, lambda: self.replayer.on_painted(painted_before))
+        return False
+
+class StallProbe(QObject):
+    # A 1 ms heartbeat; any gap beyond that is time the loop was blocked
+    def __init__(self):
+        super().__init__()
+        self.stalls = []
+        self.last = None
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.timeout.connect(self.beat)
+
+    def start(self):
+        self.last = time.perf_counter()
+        self.timer.start(HEARTBEAT_MS)
+
+    def stop(self):
+        self.timer.stop()
+
+    def beat(self):
+        now = time.perf_counter()
+        stall = (now - self.last) * 1000.0 - HEARTBEAT_MS
+        if stall > HEARTBEAT_MS:
+            self.stalls.append(stall)
+        self.last = now
+
+    def summary(self):
+        stalls = sorted(self.stalls)
+        return {
+            "count": len(stalls),
+            "total_ms": sum(stalls),
+            "p99_ms": percentile(stalls, 0.99),
+            "max_ms": stalls[-1] if stalls else 0.0,
+            "over_16ms": sum(1 for stall in stalls if stall > 16.0)
+        }
+
+class Replayer:
+    def __init__(self, app, events, times, window, hotkey_manager):
+        self.app = app
+        self.events = events
+        self.times = times
+        self.window = window
+        self.hotkey_manager = hotkey_manager
+        self.results = []
+        # Results of dispatched events still waiting for an overlay frame
+        self.waiting = []
+        self.index = 0
+        self.started_at = 0.0
+        self.loop = QEventLoop()
+        self.timer = QTimer()
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.dispatch_next)
+
+    def run(self, settle_ms):
+        self.settle_ms = settle_ms
+        self.started_at = time.perf_counter()
+        self.timer.start(0)
+        self.loop.exec_()
+
+    def dispatch_next(self):
+        # Edits that painted nothing by the time the next one comes in
+        self.finish_waiting(None)
+        event = self.events[self.index]
+        result = {"index": self.index, "kind": event["kind"], "event": describe(event)}
+        start = time.perf_counter()
+        self.dispatch(event, start)
+        end = time.perf_counter()
+        result["start"] = start
+        result["handler_ms"] = (end - start) * 1000.0
+        result["latency_ms"] = result["handler_ms"]
+        result["painted"] = False
+        self.results.append(result)
+        self.waiting.append(result)
+
+        self.index += 1
+        if self.index < len(self.events):
+            elapsed_ms = (time.perf_counter() - self.started_at) * 1000.0
+            self.timer.start(max(0, int(round(self.times[self.index] - elapsed_ms))))
+        else:
+            QTimer.singleShot(self.settle_ms, self.loop.quit)
+
+    def dispatch(self, event, now):
+        kind = event["kind"]
+        if kind == "field":
+            self.window.set_crosshair_field(event["field"], event["value"])
+        elif kind == "profile":
+            self.window.on_profile_selected(event["name"])
+        elif kind == "action":
+            # Same queued hop as a real key press from the backend thread
+            self.hotkey_manager.action_requested.emit(
+                event["action"], event.get("argument"), event.get("pressed", True), now
+            )
+        else:
+            raise ValueError(f"Unknown event kind {kind!r}")
+
+    def on_painted(self, painted_before):
+        self.finish_waiting(painted_before)
+
+    def finish_waiting(self, painted_before):
+        if painted_before is None:
+            self.waiting = []
+            return
+        now = time.perf_counter()
+        still_waiting = []
+        for result in self.waiting:
+            if result["start"] <= painted_before:
+                result["latency_ms"] = (now - result["start"]) * 1000.0
+                result["painted"] = True
+            else:
+                still_waiting.append(result)
+        self.waiting = still_waiting
+
+def summarize(results):
+    by_kind = {}
+    for result in results:
+        by_kind.setdefault(result["kind"], []).append(result["latency_ms"])
+    by_kind["all"] = [result["latency_ms"] for result in results]
+    summary = {}
+    for kind, latencies in by_kind.items():
+        latencies.sort()
+        summary[kind] = {
+            "events": len(latencies),
+            "mean_ms": sum(latencies) / len(latencies) if latencies else 0.0,
+            "p50_ms": percentile(latencies, 0.50),
+            "p90_ms": percentile(latencies, 0.90),
+            "p99_ms": percentile(latencies, 0.99),
+            "max_ms": latencies[-1] if latencies else 0.0
+        }
+    return summary
+
+def directory_bytes(path):
+    total = 0
+    for directory, _, files in os.walk(path):
+        for name in files:
+            total += os.path.getsize(os.path.join(directory, name))
+    return total
+
+def run_replay(args):
+    session = load_session(args.session)
+    events = session["events"]
+    if not events:
+        raise ValueError("Session has no events")
+    times = schedule(events, args.speed, args.max_gap_ms)
+
+    workdir = tempfile.mkdtemp(prefix="semente-replay-")
+    settings_path = os.path.join(workdir, "settings.json")
+    if os.path.exists(args.settings):
+        shutil.copyfile(args.settings, settings_path)
+    profiles_dir = os.path.join(workdir, "profiles")
+    if os.path.isdir(args.profiles):
+        shutil.copytree(args.profiles, profiles_dir)
+    log_dir = os.path.join(workdir, "logs")
+    os.makedirs(log_dir)
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    setup_logger(log_file=os.path.join(log_dir, "replay.log"),
+                 level=logging.getLevelName(args.log_level.upper()))
+    config = ConfigManager(config_path=settings_path)
+    config.load_config()
+    profile_store = ProfileStore(profiles_dir)
+    profile_store.load_index()
+
+    overlay_manager = OverlayManager(config)
+    host = MainWindowHost(config, profile_store)
+    hotkey_manager = HotkeyManager(
+        config, host, overlay_manager=overlay_manager, profile_store=profile_store, backend=FakeBackend()
+    )
+    hotkey_manager.prepare_overlay()
+    host.set_overlay(overlay_manager)
+    host.set_hotkey_manager(hotkey_manager)
+    hotkey_manager.prepare_profiles()
+    host.show()
+    window = host.get()
+    if args.overlay_shown:
+        overlay_manager.fade_in()
+
+    replayer = Replayer(app, events, times, window, hotkey_manager)
+    probe = PaintProbe(replayer)
+    for overlay in overlay_manager.overlays.values():
+        overlay.installEventFilter(probe)
+    stalls = StallProbe()
+
+    # Let startup work settle so it is not charged to the first event
+    app.processEvents()
+    config.flush()
+    writes_before = config.get_write_stats()
+    log_bytes_before = directory_bytes(log_dir)
+
+    stalls.start()
+    started = time.perf_counter()
+    replayer.run(args.settle_ms)
+    duration_ms = (time.perf_counter() - started) * 1000.0
+    stalls.stop()
+
+    config.close()
+    shutdown_logging()
+    writes_after = config.get_write_stats()
+    disk = {
+        "settings_writes": writes_after["writes_performed"] - writes_before["writes_performed"],
+        "settings_bytes": writes_after["bytes_written"] - writes_before["bytes_written"],
+        "log_bytes": directory_bytes(log_dir) - log_bytes_before
+    }
+    disk["total_bytes"] = disk["settings_bytes"] + disk["log_bytes"]
+
+    for result in replayer.results:
+        del result["start"]
+    summary = summarize(replayer.results)
+    host.destroy()
+    shutil.rmtree(workdir, ignore_errors=True)
+
+    for kind, stats in summary.items():
+        print(
+            f"{kind:8s} events={stats['events']:5d} p50={stats['p50_ms']:7.2f}ms "
+            f"p99={stats['p99_ms']:7.2f}ms max={stats['max_ms']:7.2f}ms"
+        )
+    stall_summary = stalls.summary()
+    print(
+        f"stalls   count={stall_summary['count']} total={stall_summary['total_ms']:.1f}ms "
+        f"max={stall_summary['max_ms']:.1f}ms over16ms={stall_summary['over_16ms']}"
+    )
+    print(f"disk     settings={disk['settings_bytes']}B in {disk['settings_writes']} writes, log={disk['log_bytes']}B")
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "qpa": os.environ.get("QT_QPA_PLATFORM"),
+            "session": args.session or "synthetic",
+            "speed": args.speed,
+            "max_gap_ms": args.max_gap_ms,
+            "overlay_shown": args.overlay_shown,
+            "duration_ms": duration_ms
+        },
+        "peak_rss_bytes": peak_rss_bytes(),
+        "latency": summary,
+        "stalls": stall_summary,
+        "disk": disk,
+        "events": replayer.results,
+        "metrics": metrics.snapshot()
+    }
+
+def compare(report, baseline, threshold):
+    regressions = compare_results(report["latency"], baseline.get("latency", {}), COMPARED_METRICS, threshold)
+    for section, metric in (("stalls", "total_ms"), ("stalls", "max_ms"), ("disk", "total_bytes")):
+        old = baseline.get(section, {}).get(metric, 0)
+        new = report[section].get(metric, 0)
+        if regressed(old, new, threshold):
+            regressions.append((section, metric, old, new))
+    return regressions
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Headless replay of a recorded editor session")
+    parser.add_argument("session", nargs="?", help="session recorded with main.py --record-session")
+    add_baseline_args(parser)
+    parser.add_argument("--speed", type=float, default=1.0, help="replay speed factor (default 1.0)")
+    parser.add_argument("--max-gap-ms", type=float, default=1000.0,
+                        help="shorten pauses between events to at most this long")
+    parser.add_argument("--settle-ms", type=int, default=1000,
+                        help="keep the loop running this long after the last event")
+    parser.add_argument("--settings", default=os.path.join(ROOT, "config", "settings.json"),
+                        help="settings.json to start from (copied)")
+    parser.add_argument("--profiles", default=os.path.join(ROOT, "config", "profiles"),
+                        help="profiles directory to start from (copied)")
+    parser.add_argument("--log-level", default="INFO")
+    parser.add_argument("--overlay-hidden", dest="overlay_shown", action="store_false",
+                        help="start with the overlay hidden instead of shown")
+    args = parser.parse_args(argv)
+    if args.speed <= 0:
+        parser.error("--speed must be positive")
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    return finish(run_replay(args), args, compare)
+
+if __name__ == "__main__":
+    sys.exit(main())
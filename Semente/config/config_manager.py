@@ -1,23 +1,133 @@
+import collections
+import copy
 import json
 import os
 import logging
+import threading
+import time
+
+from config.config_watcher import content_digest
+from config.crosshair_model import CrosshairSettings
+from utils.atomic_file import atomic_write_text
+from utils.metrics import metrics
+
+_write_requests = metrics.counter("config.write_requests")
+_write_failures = metrics.counter("config.write_failures")
+_bytes_written = metrics.counter("config.bytes_written")
+_write_timer = metrics.timer("config.write_ms")
+
+# Spread and hit-marker states; also the fallback for missing keys in
+# ui/crosshair_states.py
+DYNAMIC_DEFAULTS = {
+    "enabled": False,
+    "spread_px": 12,
+    "spread_in_ms": 120,
+    "spread_out_ms": 200,
+    "keyframes": 8,
+    "hit_marker_ms": 250,
+    "hit_marker_size": 6,
+    "hit_marker_gap": 4,
+    "hit_marker_thickness": 2,
+    "hit_marker_color": "#FFFFFF"
+}
+
+# Adaptive-contrast overlay tint; also the fallback for missing keys in
+# ui/adaptive_contrast.py
+CONTRAST_DEFAULTS = {
+    "enabled": False,
+    "rate_hz": 4,
+    # Width of the ring around the crosshair that is sampled
+    "margin_px": 24,
+    "cpu_budget_pct": 0.5,
+    "min_contrast": 3.0,
+    "hysteresis": 0.25,
+    "colors": ["#FFFFFF", "#000000", "#00FF00", "#FF00FF", "#00FFFF"]
+}
+
+# Every setting the app knows about. Files written by older versions are
+# loaded over a copy of this, so keys added since then get their default.
+DEFAULT_SETTINGS = {
+    "crosshair": {
+        "type": "Cross",
+        "color": "#7F00FF",
+        "thickness": 2,
+        "size": 20,
+        "opacity": 0.8
+    },
+    "hotkey": "F10",
+    "game_ready_mode": False,
+    "active_profile": None,
+    "profile_hotkeys": {},
+    "overlay_screens": "primary",
+    "log_level": "INFO",
+    "hotkey_backend": "auto",
+    "tray_backend": "auto",
+    "action_hotkeys": {
+        "hold": None,
+        "opacity_up": None,
+        "opacity_down": None,
+        "spread": None,
+        "hit_marker": None
+    },
+    "metrics_port": None,
+    "editor_idle_destroy_s": None,
+    "dynamic": copy.deepcopy(DYNAMIC_DEFAULTS),
+    "adaptive_contrast": copy.deepcopy(CONTRAST_DEFAULTS),
+    "animation": {
+        "duration_ms": 800,
+        "hide_ms": 150,
+        "cross_fade_ms": 250,
+        "easing": "OutCubic"
+    }
+}
+
+def merge_defaults(settings, defaults=DEFAULT_SETTINGS):
+    # A deep copy of defaults with settings laid over it, nested dicts merged
+    merged = copy.deepcopy(defaults)
+    for key, value in settings.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = merge_defaults(value, merged[key])
+        else:
+            merged[key] = copy.deepcopy(value)
+    return merged
+
+# After a failed save the writer waits this long before trying again
+WRITE_RETRY_S = 2.0
 
 class ConfigManager:
-    def __init__(self, config_path="config/settings.json"):
+    def __init__(self, config_path="config/settings.json", write_behind=True, debounce_ms=500):
         self.config_path = config_path
-        self.settings = {
-            "crosshair": {
-                "type": "Cross",
-                "color": "#7F00FF",
-                "thickness": 2,
-                "size": 20,
-                "opacity": 0.8
-            },
-            "hotkey": "F10",
-            "game_ready_mode": False
-        }
+        self.settings = copy.deepcopy(DEFAULT_SETTINGS)
         self.logger = logging.getLogger("Semente.ConfigManager")
 
+        # Write-behind state: settings change in memory immediately, the
+        # writer thread persists them once no change has arrived for
+        # debounce_ms.
+        self.write_behind = write_behind
+        self.debounce_ms = debounce_ms
+        self.writes_requested = 0
+        self.writes_performed = 0
+        self.bytes_written = 0
+        self._cond = threading.Condition()
+        self._io_lock = threading.Lock()
+        self._writer = None
+        self._closing = False
+        self._flush_now = False
+        self._last_change = 0.0
+        self._change_gen = 0
+        self._written_gen = 0
+        # Bumped on every failed save; flush() waits for a fresh attempt
+        self._failures = 0
+        self._failed_at = None
+        # Digests of recent writes, so the file watcher can skip our own saves
+        self._own_digests = collections.deque(maxlen=8)
+
+        # Typed view over settings["crosshair"]; edits go through it so
+        # subscribers only hear about fields that actually changed.
+        self.crosshair = CrosshairSettings(
+            self.settings["crosshair"], lock=self._cond, on_change=self._on_crosshair_changed
+        )
+
     def load_config(self):
         if not os.path.exists(self.config_path):
             self.logger.info(f"Config file not found at {self.config_path}, creating default config.")
@@ -25,35 +135,175 @@ class ConfigManager:
             return
         try:
             with open(self.config_path, "r") as f:
-                self.settings = json.load(f)
+                self.settings = merge_defaults(json.load(f))
+            self.crosshair.bind(self.settings["crosshair"])
             self.logger.info(f"Config loaded from {self.config_path}")
         except Exception as e:
             self.logger.error(f"Failed to load config: {e}")
             self.logger.info("Using default settings.")
-            self.settings = {
-                "crosshair": {
-                    "type": "Cross",
-                    "color": "#7F00FF",
-                    "thickness": 2,
-                    "size": 20,
-                    "opacity": 0.8
-                },
-                "hotkey": "F10",
-                "game_ready_mode": False
-            }
+            self.settings = copy.deepcopy(DEFAULT_SETTINGS)
+            self.crosshair.bind(self.settings["crosshair"])
 
     def save_config(self):
-        try:
-            os.makedirs(os.path.dirname(self.config_path), exist_ok=True)
-            with open(self.config_path, "w") as f:
-                json.dump(self.settings, f, indent=4)
-            self.logger.info(f"Config saved to {self.config_path}")
-        except Exception as e:
-            self.logger.error(f"Failed to save config: {e}")
+        # Synchronous save on the calling thread
+        with self._cond:
+            data = json.dumps(self.settings, indent=4)
+            gen = self._change_gen
+        return self._write_file(data, gen)
+
+    def request_save(self):
+        _write_requests.inc()
+        with self._cond:
+            self.writes_requested += 1
+            self._change_gen += 1
+            self._last_change = time.monotonic()
+            if not self.write_behind:
+                data = json.dumps(self.settings, indent=4)
+                gen = self._change_gen
+            else:
+                self._ensure_writer()
+                self._cond.notify_all()
+                return
+        self._write_file(data, gen)
+
+    def flush(self, timeout=5.0):
+        # Persist any pending change now and wait for it to reach disk.
+        # Returns False if the write failed or did not finish in time.
+        with self._cond:
+            if self._written_gen >= self._change_gen:
+                return True
+            if self._writer is None or not self._writer.is_alive():
+                data = json.dumps(self.settings, indent=4)
+                gen = self._change_gen
+            else:
+                target = self._change_gen
+                failures = self._failures
+                self._flush_now = True
+                self._cond.notify_all()
+                deadline = time.monotonic() + timeout
+                while self._written_gen < target:
+                    if self._failures > failures:
+                        return False
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.logger.warning("Timed out waiting for pending config write")
+                        return False
+                    self._cond.wait(remaining)
+                return True
+        return self._write_file(data, gen)
+
+    def close(self):
+        if not self.flush():
+            self.logger.error(f"Unsaved settings changes could not be written to {self.config_path}")
+        with self._cond:
+            self._closing = True
+            self._cond.notify_all()
+        if self._writer is not None:
+            self._writer.join(timeout=1.0)
+            self._writer = None
+
+    def get_write_stats(self):
+        with self._cond:
+            return {
+                "writes_requested": self.writes_requested,
+                "writes_performed": self.writes_performed,
+                "bytes_written": self.bytes_written,
+                "pending": self._written_gen < self._change_gen
+            }
+
+    def _ensure_writer(self):
+        if self._writer is None or not self._writer.is_alive():
+            self._closing = False
+            self._writer = threading.Thread(
+                target=self._writer_loop, name="SementeConfigWriter", daemon=True
+            )
+            self._writer.start()
+
+    def _writer_loop(self):
+        while True:
+            with self._cond:
+                while self._written_gen >= self._change_gen and not self._closing:
+                    self._cond.wait()
+                if self._written_gen >= self._change_gen:
+                    return
+                # Coalesce: keep waiting while changes are still arriving,
+                # and back off after a failed save
+                while not self._flush_now and not self._closing:
+                    remaining = self._last_change + self.debounce_ms / 1000.0 - time.monotonic()
+                    if self._failed_at is not None:
+                        remaining = max(remaining, self._failed_at + WRITE_RETRY_S - time.monotonic())
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                if self._closing and self._failed_at is not None and not self._flush_now:
+                    # close() already tried once; give up rather than spin
+                    return
+                self._flush_now = False
+                data = json.dumps(self.settings, indent=4)
+                gen = self._change_gen
+            self._write_file(data, gen)
+
+    def _write_file(self, data, gen):
+        with self._io_lock:
+            written = 0
+            started_at = time.perf_counter()
+            try:
+                self._own_digests.append(content_digest(data))
+                written = atomic_write_text(self.config_path, data)
+                _write_timer.observe_since(started_at)
+                _bytes_written.inc(written)
+                self.logger.debug("Config saved to %s", self.config_path)
+            except Exception as e:
+                _write_failures.inc()
+                self.logger.error(f"Failed to save config: {e}")
+        with self._cond:
+            if written:
+                self.writes_performed += 1
+                self.bytes_written += written
+                self._failed_at = None
+                if gen > self._written_gen:
+                    self._written_gen = gen
+            else:
+                # The generation stays pending so the save is retried
+                self._failures += 1
+                self._failed_at = time.monotonic()
+            self._cond.notify_all()
+        return bool(written)
+
+    def is_own_write(self, digest):
+        return digest in self._own_digests
+
+    def apply_external(self, settings):
+        # Adopt settings edited outside the app without writing them back.
+        # Returns the top-level keys whose value changed; crosshair fields
+        # are diffed by the model, which notifies only the changed ones.
+        if not isinstance(settings.get("crosshair"), dict):
+            settings["crosshair"] = {}
+        settings = merge_defaults(settings)
+        crosshair = settings["crosshair"]
+        with self._cond:
+            changed = {
+                key for key in set(settings) | set(self.settings)
+                if key != "crosshair" and settings.get(key) != self.settings.get(key)
+            }
+            self.settings = settings
+        crosshair_changes = self.crosshair.bind(crosshair)
+        if crosshair_changes:
+            changed.add("crosshair")
+        return changed
 
     def get_setting(self, key):
         return self.settings.get(key)
 
+    def _on_crosshair_changed(self, changes):
+        self.request_save()
+
     def set_setting(self, key, value):
-        self.settings[key] = value
-        self.save_config()
+        if key == "crosshair":
+            # Route whole-dict replacements through the model so only the
+            # differing fields are applied and announced.
+            self.crosshair.update(value)
+            return
+        with self._cond:
+            self.settings[key] = value
+        self.request_save()
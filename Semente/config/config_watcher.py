@@ -0,0 +1,182 @@
+import ctypes
+import ctypes.util
+import hashlib
+import json
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+import time
+
+from utils.metrics import metrics
+
+_reloads = metrics.counter("config.reloads")
+_reloads_skipped = metrics.counter("config.reloads_skipped")
+
+# inotify(7) constants
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+IN_MODIFY = 0x002
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+_EVENT_HEADER = struct.Struct("iIII")
+
+def content_digest(data):
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha1(data).hexdigest()
+
+def _load_inotify():
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1
+        libc.inotify_add_watch
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+class ConfigWatcher:
+    # Watches one settings file from a background thread: inotify on Linux,
+    # mtime polling elsewhere. Bursts of events are debounced, content the
+    # app wrote itself (is_own_write(digest) is true) is skipped, and the
+    # file is parsed here so on_change(settings) receives a ready dict.
+    def __init__(self, path, on_change, is_own_write=None, debounce_ms=250, poll_interval=1.0):
+        self.path = os.path.abspath(path)
+        self.on_change = on_change
+        self.is_own_write = is_own_write
+        self.debounce = debounce_ms / 1000.0
+        self.poll_interval = poll_interval
+        self.last_digest = None
+        self.thread = None
+        self.stopping = threading.Event()
+        self.wake_pipe = None
+        self.mode = None
+        self.logger = logging.getLogger("Semente.ConfigWatcher")
+
+    def start(self):
+        if self.thread is not None:
+            return
+        self.last_digest = self.read_digest()
+        self.stopping.clear()
+        libc = _load_inotify()
+        fd = self.add_inotify_watch(libc) if libc else -1
+        if fd >= 0:
+            self.mode = "inotify"
+            self.wake_pipe = os.pipe()
+            target = lambda: self.run_inotify(fd)
+        else:
+            self.mode = "polling"
+            target = self.run_polling
+        self.thread = threading.Thread(target=target, name="SementeConfigWatcher", daemon=True)
+        self.thread.start()
+        self.logger.info(f"Watching {self.path} ({self.mode})")
+
+    def stop(self):
+        if self.thread is None:
+            return
+        self.stopping.set()
+        if self.wake_pipe is not None:
+            os.write(self.wake_pipe[1], b"x")
+        self.thread.join(1.0)
+        self.thread = None
+        if self.wake_pipe is not None:
+            for fd in self.wake_pipe:
+                os.close(fd)
+            self.wake_pipe = None
+
+    def add_inotify_watch(self, libc):
+        # The directory is watched rather than the file: atomic saves
+        # (ours and most editors') replace the file with a new inode.
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            return -1
+        mask = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_MODIFY
+        directory = os.path.dirname(self.path).encode()
+        if libc.inotify_add_watch(fd, directory, mask) < 0:
+            os.close(fd)
+            return -1
+        return fd
+
+    def run_inotify(self, fd):
+        name = os.path.basename(self.path).encode()
+        deadline = None
+        try:
+            while not self.stopping.is_set():
+                timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+                readable, _, _ = select.select([fd, self.wake_pipe[0]], [], [], timeout)
+                if fd in readable and self.touches(os.read(fd, 65536), name):
+                    deadline = time.monotonic() + self.debounce
+                if deadline is not None and time.monotonic() >= deadline:
+                    deadline = None
+                    self.check()
+        finally:
+            os.close(fd)
+
+    def touches(self, buffer, name):
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(buffer):
+            _, _, _, length = _EVENT_HEADER.unpack_from(buffer, offset)
+            offset += _EVENT_HEADER.size
+            if buffer[offset:offset + length].rstrip(b"\0") == name:
+                return True
+            offset += length
+        return False
+
+    def stat_key(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    def run_polling(self):
+        last = self.stat_key()
+        while not self.stopping.wait(self.poll_interval):
+            current = self.stat_key()
+            if current == last:
+                continue
+            # Wait for the file to stop changing before reading it
+            while not self.stopping.wait(self.debounce):
+                settled = self.stat_key()
+                if settled == current:
+                    break
+                current = settled
+            last = current
+            self.check()
+
+    def read_digest(self):
+        try:
+            with open(self.path, "rb") as f:
+                return content_digest(f.read())
+        except OSError:
+            return None
+
+    def check(self):
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return
+        digest = content_digest(data)
+        if digest == self.last_digest:
+            return
+        self.last_digest = digest
+        if self.is_own_write is not None and self.is_own_write(digest):
+            _reloads_skipped.inc()
+            return
+        try:
+            settings = json.loads(data)
+        except ValueError as e:
+            # Often a half-finished save; the next event brings the rest
+            self.logger.warning(f"Ignoring {self.path}: {e}")
+            return
+        if not isinstance(settings, dict):
+            self.logger.warning(f"Ignoring {self.path}: top level is not an object")
+            return
+        _reloads.inc()
+        self.on_change(settings)
@@ -0,0 +1,141 @@
+import re
+import threading
+
+CROSSHAIR_TYPES = ("Point", "Cross", "Circle", "Square")
+
+_COLOR_RE = re.compile(r"^#(?:[0-9a-fA-F]{6}|[0-9a-fA-F]{8})$")
+
+def _validate_type(value):
+    if value not in CROSSHAIR_TYPES:
+        raise ValueError(f"Unknown crosshair type: {value!r}")
+    return value
+
+def _validate_color(value):
+    if not isinstance(value, str) or not _COLOR_RE.match(value):
+        raise ValueError(f"Invalid color {value!r}, expected #RRGGBB or #AARRGGBB")
+    return value.upper()
+
+def _int_range(low, high):
+    def validate(value):
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or int(value) != value:
+            raise ValueError(f"Expected an integer, got {value!r}")
+        value = int(value)
+        if not low <= value <= high:
+            raise ValueError(f"{value} is outside {low}-{high}")
+        return value
+    return validate
+
+def _validate_opacity(value):
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"Expected a number, got {value!r}")
+    value = round(float(value), 3)
+    if not 0.0 <= value <= 1.0:
+        raise ValueError(f"Opacity {value} is outside 0.0-1.0")
+    return value
+
+def _validate_bool(value):
+    if not isinstance(value, bool):
+        raise ValueError(f"Expected true or false, got {value!r}")
+    return value
+
+def _validate_layers(value):
+    if not isinstance(value, list) or not all(isinstance(layer, dict) for layer in value):
+        raise ValueError("Layers must be a list of objects")
+    return value
+
+# field -> (default, validator)
+CROSSHAIR_FIELDS = {
+    "type": ("Cross", _validate_type),
+    "color": ("#7F00FF", _validate_color),
+    "thickness": (2, _int_range(1, 20)),
+    "size": (20, _int_range(1, 200)),
+    "opacity": (0.8, _validate_opacity),
+    "gap": (0, _int_range(0, 50)),
+    "dot": (False, _validate_bool),
+    "outline": (False, _validate_bool),
+    "outline_color": ("#000000", _validate_color),
+    "outline_thickness": (1, _int_range(0, 5)),
+    "layers": ([], _validate_layers)
+}
+
+def normalize_crosshair(values):
+    # Full, validated field dict with defaults for anything missing
+    normalized = {}
+    for field, (default, validate) in CROSSHAIR_FIELDS.items():
+        normalized[field] = validate(values[field]) if field in values else default
+    return normalized
+
+class CrosshairSettings:
+    __slots__ = tuple(CROSSHAIR_FIELDS) + ("store", "lock", "on_change", "subscribers")
+
+    def __init__(self, store=None, lock=None, on_change=None):
+        # store is the "crosshair" dict inside the settings; changes are
+        # written into it in place so persistence never copies it.
+        self.store = {}
+        self.lock = lock or threading.RLock()
+        self.on_change = on_change
+        self.subscribers = []
+        for field, (default, _) in CROSSHAIR_FIELDS.items():
+            setattr(self, field, default)
+        self.bind(store if store is not None else {})
+
+    def validate(self, field, value):
+        if field not in CROSSHAIR_FIELDS:
+            raise KeyError(f"Unknown crosshair field: {field}")
+        return CROSSHAIR_FIELDS[field][1](value)
+
+    def bind(self, store):
+        # Adopt a new backing dict (e.g. after loading settings.json),
+        # keeping the subscribers and notifying only the fields that differ.
+        values = {}
+        for field, (default, validate) in CROSSHAIR_FIELDS.items():
+            try:
+                values[field] = validate(store[field]) if field in store else default
+            except ValueError:
+                values[field] = default
+        with self.lock:
+            self.store = store
+        return self._apply(values, persist=False)
+
+    def get(self, field, default=None):
+        # Mapping-style access so the model can stand in for the settings dict
+        return getattr(self, field, default)
+
+    def set(self, field, value):
+        return bool(self.update({field: value}))
+
+    def update(self, values):
+        validated = {field: self.validate(field, value) for field, value in values.items()}
+        return self._apply(validated)
+
+    def _apply(self, values, persist=True):
+        changes = {}
+        with self.lock:
+            for field, value in values.items():
+                if getattr(self, field) != value:
+                    setattr(self, field, value)
+                    changes[field] = value
+                if field in changes or field in self.store:
+                    self.store[field] = value
+        if not changes:
+            return changes
+        if persist and self.on_change:
+            self.on_change(changes)
+        for fields, callback in list(self.subscribers):
+            relevant = changes if fields is None else {f: v for f, v in changes.items() if f in fields}
+            if relevant:
+                callback(relevant)
+        return changes
+
+    def subscribe(self, callback, fields=None):
+        # callback(changes) receives {field: new_value} for changed fields
+        entry = (frozenset(fields) if fields is not None else None, callback)
+        self.subscribers.append(entry)
+        return entry
+
+    def unsubscribe(self, token):
+        if token in self.subscribers:
+            self.subscribers.remove(token)
+
+    def as_dict(self):
+        return {field: getattr(self, field) for field in CROSSHAIR_FIELDS}
@@ -0,0 +1,125 @@
+import json
+import logging
+import os
+import re
+import time
+
+from config.crosshair_model import normalize_crosshair
+from utils.atomic_file import atomic_write_text
+
+INDEX_VERSION = 1
+
+class ProfileStore:
+    # Named crosshair profiles, one JSON file each, plus an index.json that
+    # lists them. Startup reads only the index; profile files are parsed on
+    # first use or when prepared ahead of time for hotkey switching.
+    def __init__(self, directory="config/profiles"):
+        self.directory = directory
+        self.index_path = os.path.join(directory, "index.json")
+        self.index = {}
+        self.loaded = {}
+        self.logger = logging.getLogger("Semente.ProfileStore")
+
+    def load_index(self):
+        self.loaded.clear()
+        if not os.path.exists(self.index_path):
+            self.index = self.rebuild_index()
+            return
+        try:
+            with open(self.index_path, "r") as f:
+                data = json.load(f)
+            self.index = data.get("profiles", {})
+            self.logger.info(f"Profile index loaded: {len(self.index)} profiles")
+        except Exception as e:
+            self.logger.error(f"Failed to load profile index: {e}")
+            self.index = self.rebuild_index()
+
+    def rebuild_index(self):
+        # Recover the index from file names alone, without parsing profiles
+        index = {}
+        if os.path.isdir(self.directory):
+            for file_name in sorted(os.listdir(self.directory)):
+                if file_name.endswith(".json") and file_name != "index.json":
+                    index[file_name[:-5]] = {"file": file_name, "updated": 0}
+        if index:
+            self.logger.info(f"Rebuilt profile index from {len(index)} files")
+            self.save_index(index)
+        return index
+
+    def save_index(self, index=None):
+        data = {"version": INDEX_VERSION, "profiles": self.index if index is None else index}
+        atomic_write_text(self.index_path, json.dumps(data, indent=4))
+
+    def names(self):
+        return sorted(self.index, key=str.lower)
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def __len__(self):
+        return len(self.index)
+
+    def get(self, name):
+        values = self.loaded.get(name)
+        if values is not None:
+            return values
+        values = self.read(name)
+        self.loaded[name] = values
+        return values
+
+    def read(self, name):
+        # Parse a profile without caching it. Safe to call from worker
+        # threads; get() and everything that changes the cache stay on the
+        # GUI thread.
+        entry = self.index.get(name)
+        if entry is None:
+            raise KeyError(f"Unknown profile: {name}")
+        with open(os.path.join(self.directory, entry["file"]), "r") as f:
+            return normalize_crosshair(json.load(f))
+
+    def prepare(self, names):
+        # Parse and validate the given profiles now so later lookups are
+        # plain dict hits with no disk access.
+        prepared = {}
+        for name in names:
+            try:
+                prepared[name] = self.get(name)
+            except Exception as e:
+                self.logger.error(f"Failed to prepare profile {name}: {e}")
+        return prepared
+
+    def file_name_for(self, name):
+        entry = self.index.get(name)
+        if entry:
+            return entry["file"]
+        base = re.sub(r"[^A-Za-z0-9_-]+", "_", name).strip("_") or "profile"
+        used = {entry["file"] for entry in self.index.values()}
+        file_name = f"{base}.json"
+        counter = 2
+        while file_name in used or file_name == "index.json":
+            file_name = f"{base}_{counter}.json"
+            counter += 1
+        return file_name
+
+    def save(self, name, crosshair):
+        values = normalize_crosshair(crosshair)
+        file_name = self.file_name_for(name)
+        atomic_write_text(os.path.join(self.directory, file_name), json.dumps(values, indent=4))
+        self.index[name] = {"file": file_name, "updated": int(time.time())}
+        self.loaded[name] = values
+        self.save_index()
+        self.logger.info(f"Profile saved: {name}")
+        return values
+
+    def delete(self, name):
+        entry = self.index.pop(name, None)
+        if entry is None:
+            return False
+        self.loaded.pop(name, None)
+        try:
+            os.remove(os.path.join(self.directory, entry["file"]))
+        except OSError as e:
+            self.logger.warning(f"Failed to remove profile file for {name}: {e}")
+        self.save_index()
+        self.logger.info(f"Profile deleted: {name}")
+        return True
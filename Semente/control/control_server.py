@@ -0,0 +1,121 @@
+import json
+import logging
+import threading
+
+from PyQt5.QtCore import QObject, Qt, pyqtSignal
+
+from utils.metrics import metrics
+
+_command_timer = metrics.timer("control.command_ms")
+
+class _Request:
+    __slots__ = ("command", "reply", "done")
+
+    def __init__(self, command):
+        self.command = command
+        self.reply = "error: no reply"
+        self.done = threading.Event()
+
+class ControlServer(QObject):
+    # Runs commands from the instance socket on the GUI thread. The socket
+    # thread waits for the reply so the client learns whether it worked.
+    command_received = pyqtSignal(object)
+
+    def __init__(self, listener, commands, reply_timeout=2.0):
+        super().__init__()
+        self.listener = listener
+        self.commands = commands
+        self.reply_timeout = reply_timeout
+        self.logger = logging.getLogger("Semente.ControlServer")
+        self.command_received.connect(self.on_command_received, Qt.QueuedConnection)
+        listener.handler = self.handle
+
+    def start(self):
+        self.listener.start()
+        self.logger.info("Control socket listening")
+
+    def handle(self, command):
+        # Listener thread
+        request = _Request(command)
+        self.command_received.emit(request)
+        if not request.done.wait(self.reply_timeout):
+            return "error: timed out"
+        return request.reply
+
+    def on_command_received(self, request):
+        try:
+            request.reply = self.run(request.command)
+        finally:
+            request.done.set()
+
+    def run(self, command):
+        with _command_timer.time():
+            name, _, argument = command.strip().partition(" ")
+            handler = self.commands.get(name.lower())
+            if handler is None:
+                return f"error: unknown command {name!r}; expected one of {', '.join(sorted(self.commands))}"
+            try:
+                result = handler(argument.strip())
+            except Exception as e:
+                self.logger.warning(f"Control command {command!r} failed: {e}")
+                return f"error: {e}"
+            self.logger.info(f"Control command: {command}")
+            return f"ok {result}" if result else "ok"
+
+def parse_assignments(argument):
+    # "size=30 color=#FF0000" -> {"size": 30, "color": "#FF0000"}
+    values = {}
+    for item in argument.split():
+        field, sep, raw = item.partition("=")
+        if not sep or not field:
+            raise ValueError(f"Expected field=value, got {item!r}")
+        try:
+            values[field] = json.loads(raw)
+        except ValueError:
+            values[field] = raw
+    if not values:
+        raise ValueError("Nothing to set")
+    return values
+
+def default_commands(config, main_window, hotkey_manager):
+    overlay = hotkey_manager.overlay_manager
+
+    def toggle(argument):
+        hotkey_manager.toggle_overlay()
+        return "shown" if overlay.is_shown() else "hidden"
+
+    def show(argument):
+        overlay.fade_in()
+
+    def hide(argument):
+        overlay.fade_out()
+
+    def ui(argument):
+        main_window.show()
+
+    def profile(argument):
+        store = hotkey_manager.profile_store
+        if not argument or store is None or argument not in store:
+            raise ValueError(f"Unknown profile: {argument}")
+        hotkey_manager.switch_profile(argument)
+
+    def set_fields(argument):
+        changes = config.crosshair.update(parse_assignments(argument))
+        return " ".join(f"{field}={value}" for field, value in changes.items())
+
+    def hit(argument):
+        overlay.trigger_hit_marker()
+
+    def ping(argument):
+        return "pong"
+
+    return {
+        "toggle": toggle,
+        "show": show,
+        "hide": hide,
+        "ui": ui,
+        "profile": profile,
+        "set": set_fields,
+        "hit": hit,
+        "ping": ping
+    }
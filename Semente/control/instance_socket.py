@@ -0,0 +1,125 @@
+import errno
+import logging
+import os
+import socket
+import sys
+import tempfile
+import threading
+
+# Imported before Qt by main.py so a second launch can hand its command to
+# the running instance and exit without paying for any GUI startup.
+
+DEFAULT_TCP_PORT = 47231
+MAX_COMMAND_BYTES = 4096
+
+def socket_address(name="semente"):
+    # A per-user Unix socket where available, a fixed localhost port otherwise
+    if sys.platform != "win32" and hasattr(socket, "AF_UNIX"):
+        base = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+        return socket.AF_UNIX, os.path.join(base, f"{name}-{os.getuid()}.sock")
+    return socket.AF_INET, ("127.0.0.1", DEFAULT_TCP_PORT)
+
+def _read_line(sock):
+    data = b""
+    while b"\n" not in data and len(data) < MAX_COMMAND_BYTES:
+        chunk = sock.recv(1024)
+        if not chunk:
+            break
+        data += chunk
+    return data.split(b"\n", 1)[0].decode("utf-8", "replace").strip()
+
+def send_command(command, timeout=2.0, address=None):
+    # Raises OSError when no instance is listening
+    family, addr = address or socket_address()
+    with socket.socket(family, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(addr)
+        sock.sendall(command.encode("utf-8") + b"\n")
+        return _read_line(sock)
+
+class InstanceListener:
+    # Owning the bound socket is what makes this the single running
+    # instance. Commands are read one line per connection and answered with
+    # one line from handler(command), called on the listener thread.
+    def __init__(self, address=None, handler=None):
+        self.family, self.address = address or socket_address()
+        self.handler = handler
+        self.sock = None
+        self.thread = None
+        self.logger = logging.getLogger("Semente.InstanceListener")
+
+    def bind(self):
+        sock = socket.socket(self.family, socket.SOCK_STREAM)
+        try:
+            if self.family == socket.AF_UNIX:
+                self._bind_unix(sock)
+            else:
+                if hasattr(socket, "SO_EXCLUSIVEADDRUSE"):
+                    sock.setsockopt(socket.SOL_SOCKET, socket.SO_EXCLUSIVEADDRUSE, 1)
+                sock.bind(self.address)
+            sock.listen(8)
+        except OSError:
+            sock.close()
+            return False
+        self.sock = sock
+        return True
+
+    def _bind_unix(self, sock):
+        try:
+            sock.bind(self.address)
+        except OSError as e:
+            if e.errno != errno.EADDRINUSE:
+                raise
+            # Left behind by a crashed instance unless someone answers on it
+            if self._answers():
+                raise
+            os.unlink(self.address)
+            sock.bind(self.address)
+        os.chmod(self.address, 0o600)
+
+    def _answers(self):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(self.address)
+                return True
+            except OSError:
+                return False
+
+    def start(self):
+        # Connections made before this point wait in the listen backlog
+        self.thread = threading.Thread(target=self.serve, name="SementeControl", daemon=True)
+        self.thread.start()
+
+    def serve(self):
+        while self.sock is not None:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                break
+            with conn:
+                try:
+                    conn.settimeout(2.0)
+                    command = _read_line(conn)
+                    if not command:
+                        # A liveness probe from another instance
+                        continue
+                    reply = self.handler(command) if self.handler else "error: not ready"
+                    conn.sendall(reply.encode("utf-8") + b"\n")
+                except OSError as e:
+                    self.logger.warning(f"Control connection failed: {e}")
+
+    def stop(self):
+        sock, self.sock = self.sock, None
+        if sock is None:
+            return
+        if self.family == socket.AF_UNIX:
+            try:
+                os.unlink(self.address)
+            except OSError:
+                pass
+        # Unblocks accept() on the listener thread
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        sock.close()
@@ -0,0 +1,157 @@
+import importlib.util
+import logging
+import select
+import sys
+import threading
+import time
+
+from hotkey.bindings import MODIFIERS, normalize_key, parse_combo
+
+# A backend delivers every key press and release as
+# on_key(canonical key name, pressed, time.perf_counter() timestamp),
+# from whatever thread it listens on.
+
+class HotkeyBackend:
+    name = "base"
+
+    def start(self, on_key):
+        raise NotImplementedError
+
+    def stop(self):
+        pass
+
+class KeyboardBackend(HotkeyBackend):
+    # The keyboard module: Windows, and Linux when run as root
+    name = "keyboard"
+
+    def __init__(self):
+        self.keyboard = None
+        self.hook = None
+
+    def start(self, on_key):
+        import keyboard
+        self.keyboard = keyboard
+        key_down = keyboard.KEY_DOWN
+        def on_event(event):
+            if event.name:
+                on_key(normalize_key(event.name), event.event_type == key_down, time.perf_counter())
+        self.hook = keyboard.hook(on_event)
+
+    def stop(self):
+        if self.hook is not None:
+            self.keyboard.unhook(self.hook)
+            self.hook = None
+
+class EvdevBackend(HotkeyBackend):
+    # Reads /dev/input directly on Linux; needs read access to the keyboard
+    # devices (e.g. membership of the input group), not root.
+    name = "evdev"
+
+    def __init__(self):
+        self.devices = []
+        self.thread = None
+        self.running = False
+        self.logger = logging.getLogger("Semente.EvdevBackend")
+
+    def start(self, on_key):
+        import evdev
+        ecodes = evdev.ecodes
+        for path in evdev.list_devices():
+            try:
+                device = evdev.InputDevice(path)
+            except OSError:
+                continue
+            keys = device.capabilities().get(ecodes.EV_KEY, [])
+            if ecodes.KEY_A in keys and ecodes.KEY_SPACE in keys:
+                self.devices.append(device)
+            else:
+                device.close()
+        if not self.devices:
+            raise RuntimeError("No readable keyboard devices under /dev/input")
+
+        names = {}
+        for code, name in ecodes.KEY.items():
+            # Some codes have several names; the first is the canonical one
+            if isinstance(name, list):
+                name = name[0]
+            names[code] = normalize_key(name[4:] if name.startswith("KEY_") else name)
+
+        self.running = True
+        self.thread = threading.Thread(
+            target=self.read_loop, args=(on_key, names, ecodes.EV_KEY), name="SementeEvdev", daemon=True
+        )
+        self.thread.start()
+        self.logger.info(f"Listening on {len(self.devices)} keyboard devices")
+
+    def read_loop(self, on_key, names, ev_key):
+        devices = {device.fd: device for device in self.devices}
+        while self.running:
+            readable, _, _ = select.select(list(devices), [], [], 0.5)
+            for fd in readable:
+                try:
+                    events = list(devices[fd].read())
+                except OSError:
+                    # Unplugged
+                    devices.pop(fd).close()
+                    continue
+                now = time.perf_counter()
+                for event in events:
+                    # value: 0 release, 1 press, 2 auto-repeat
+                    if event.type == ev_key and event.code in names:
+                        on_key(names[event.code], event.value != 0, now)
+
+    def stop(self):
+        self.running = False
+        if self.thread is not None:
+            self.thread.join(1.0)
+            self.thread = None
+        for device in self.devices:
+            device.close()
+        self.devices = []
+
+class FakeBackend(HotkeyBackend):
+    # In-process backend for tests and benchmarks: events are injected by
+    # calling press/release/tap and dispatched synchronously.
+    name = "fake"
+
+    def __init__(self):
+        self.on_key = None
+
+    def start(self, on_key):
+        self.on_key = on_key
+
+    def stop(self):
+        self.on_key = None
+
+    def press(self, key):
+        self.on_key(normalize_key(key), True, time.perf_counter())
+
+    def release(self, key):
+        self.on_key(normalize_key(key), False, time.perf_counter())
+
+    def tap(self, combo):
+        key, modifiers = parse_combo(combo)
+        held = [modifier for modifier in MODIFIERS if modifier in modifiers]
+        for modifier in held:
+            self.press(modifier)
+        self.press(key)
+        self.release(key)
+        for modifier in reversed(held):
+            self.release(modifier)
+
+BACKENDS = {
+    KeyboardBackend.name: KeyboardBackend,
+    EvdevBackend.name: EvdevBackend,
+    FakeBackend.name: FakeBackend
+}
+
+def create_backend(name="auto"):
+    if name in BACKENDS:
+        return BACKENDS[name]()
+    if name != "auto":
+        raise ValueError(f"Unknown hotkey backend: {name}")
+    # Prefer the keyboard module as before; fall back to evdev on Linux
+    if importlib.util.find_spec("keyboard") is None and sys.platform.startswith("linux") \
+            and importlib.util.find_spec("evdev") is not None:
+        return EvdevBackend()
+    return KeyboardBackend()
@@ -0,0 +1,120 @@
+import logging
+
+# Canonical key names shared by every backend: lower case, modifiers
+# without a side, named keys spelled the way the keyboard module does.
+MODIFIERS = ("ctrl", "shift", "alt", "windows")
+
+KEY_ALIASES = {
+    "control": "ctrl", "left ctrl": "ctrl", "right ctrl": "ctrl",
+    "leftctrl": "ctrl", "rightctrl": "ctrl",
+    "left shift": "shift", "right shift": "shift", "leftshift": "shift", "rightshift": "shift",
+    "left alt": "alt", "right alt": "alt", "alt gr": "alt", "leftalt": "alt", "rightalt": "alt",
+    "option": "alt",
+    "win": "windows", "left windows": "windows", "right windows": "windows",
+    "super": "windows", "meta": "windows", "cmd": "windows", "command": "windows",
+    "leftmeta": "windows", "rightmeta": "windows",
+    "escape": "esc", "return": "enter", "del": "delete", "ins": "insert",
+    "pgup": "page up", "pageup": "page up", "page_up": "page up",
+    "pgdn": "page down", "pagedown": "page down", "page_down": "page down",
+    "capslock": "caps lock", "numlock": "num lock", "scrolllock": "scroll lock",
+    "sysrq": "print screen", "printscreen": "print screen", "prtsc": "print screen",
+    "minus": "-", "equal": "=", "plus": "+", "comma": ",", "dot": ".", "period": ".",
+    "slash": "/", "semicolon": ";", "apostrophe": "'", "grave": "`",
+    "leftbrace": "[", "rightbrace": "]", "backslash": "\\"
+}
+
+NAMED_KEYS = {
+    "space", "enter", "esc", "tab", "backspace", "up", "down", "left", "right",
+    "home", "end", "page up", "page down", "insert", "delete", "caps lock",
+    "print screen", "scroll lock", "pause", "num lock", "menu"
+} | {f"f{number}" for number in range(1, 25)}
+
+def normalize_key(name):
+    name = " ".join(str(name).strip().lower().split())
+    return KEY_ALIASES.get(name, name)
+
+def parse_combo(text):
+    # "Ctrl+Shift+F10" -> ("f10", frozenset({"ctrl", "shift"})). Raises
+    # ValueError for anything that cannot be bound.
+    if not text or not str(text).strip():
+        raise ValueError("Hotkey is empty")
+    parts = [part for part in str(text).split("+")]
+    # A trailing "+" means the plus key itself, e.g. "ctrl++"
+    if str(text).strip().endswith("++"):
+        parts = parts[:-2] + ["+"]
+    modifiers = set()
+    key = None
+    for part in parts:
+        name = normalize_key(part)
+        if not name:
+            raise ValueError(f"Malformed hotkey: {text}")
+        if name in MODIFIERS:
+            modifiers.add(name)
+        elif key is not None:
+            raise ValueError(f"Hotkey has more than one non-modifier key: {text}")
+        elif len(name) == 1 or name in NAMED_KEYS:
+            key = name
+        else:
+            raise ValueError(f"Unknown key {part.strip()!r} in hotkey {text}")
+    if key is None:
+        raise ValueError(f"Hotkey needs a non-modifier key: {text}")
+    return key, frozenset(modifiers)
+
+def format_combo(combo):
+    key, modifiers = combo
+    return "+".join([modifier for modifier in MODIFIERS if modifier in modifiers] + [key])
+
+class HotkeyDispatcher:
+    # Turns raw key events from a backend into binding actions. Runs on the
+    # backend's thread; the table is replaced wholesale on re-registration,
+    # so a lookup never sees a half-built table and needs no lock.
+    def __init__(self, emit):
+        self.emit = emit
+        self.table = {}
+        self.modifiers = set()
+        self.down = set()
+        # key -> binding whose release must be reported (hold-to-show)
+        self.holds = {}
+        self.logger = logging.getLogger("Semente.HotkeyDispatcher")
+
+    def build(self, bindings):
+        # bindings: iterable of (combo text, action, argument, wants_release).
+        # Returns the list of (combo text, error) that were rejected.
+        table = {}
+        rejected = []
+        for text, action, argument, wants_release in bindings:
+            try:
+                combo = parse_combo(text)
+            except ValueError as e:
+                rejected.append((text, str(e)))
+                continue
+            if combo in table:
+                rejected.append((text, f"already bound to {table[combo][0]}"))
+                continue
+            table[combo] = (action, argument, wants_release)
+        self.table = table
+        return rejected
+
+    def on_key(self, key, pressed, timestamp):
+        if key in MODIFIERS:
+            if pressed:
+                self.modifiers.add(key)
+            else:
+                self.modifiers.discard(key)
+            return
+        if not pressed:
+            self.down.discard(key)
+            binding = self.holds.pop(key, None)
+            if binding is not None:
+                self.emit(binding[0], binding[1], False, timestamp)
+            return
+        if key in self.down:
+            # Auto-repeat while held
+            return
+        self.down.add(key)
+        binding = self.table.get((key, frozenset(self.modifiers)))
+        if binding is None:
+            return
+        if binding[2]:
+            self.holds[key] = binding
+        self.emit(binding[0], binding[1], True, timestamp)
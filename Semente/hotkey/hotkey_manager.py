@@ -1,39 +1,214 @@
-import keyboard
 import logging
+import sys
+import time
 
-class HotkeyManager:
-    def __init__(self, config, main_window):
+from PyQt5.QtCore import QObject, Qt, pyqtSignal
+
+from hotkey.backends import KeyboardBackend, create_backend
+from hotkey.bindings import HotkeyDispatcher, format_combo, parse_combo
+from utils.metrics import metrics
+
+OPACITY_STEP = 0.05
+
+_dispatch_timer = metrics.timer("hotkey.dispatch_ms")
+_press_to_visible_timer = metrics.timer("hotkey.press_to_visible_ms")
+
+class HotkeyManager(QObject):
+    # Carries the action, its argument, press (True) or release (False) and
+    # the time.perf_counter() timestamp of the key event from the backend's
+    # listener thread into the GUI thread.
+    action_requested = pyqtSignal(str, object, bool, float)
+
+    def __init__(self, config, main_window, overlay_manager=None, profile_store=None, backend=None):
+        super().__init__()
         self.config = config
         self.main_window = main_window
-        self.overlay_window = None
+        self.overlay_manager = overlay_manager
+        self.profile_store = profile_store
         self.logger = logging.getLogger("Semente.HotkeyManager")
-        self.registered_hotkey = None
+        self.backend = backend
+        self.dispatcher = HotkeyDispatcher(self.action_requested.emit)
+        self.prepared_profiles = {}
+        self.hold_revealed = False
+        self.press_to_visible = _press_to_visible_timer.histogram
+        self.action_requested.connect(self.on_action, Qt.QueuedConnection)
+
+    def prepare_overlay(self):
+        # Build and pre-render the overlay up front so the first hotkey
+        # press only has to show an existing window.
+        if not self.overlay_manager:
+            # Lazy import to avoid circular dependency
+            from ui.overlay_manager import OverlayManager
+            self.overlay_manager = OverlayManager(self.config)
+        self.overlay_manager.presented.connect(self.on_overlay_presented)
+        self.overlay_manager.prerender()
+        self.logger.info("Overlay prepared")
 
-    def register_hotkey(self):
+    def start_backend(self):
+        if self.backend is not None:
+            return True
+        choice = self.config.get_setting("hotkey_backend") or "auto"
+        try:
+            self.backend = create_backend(choice)
+            self.backend.start(self.dispatcher.on_key)
+        except Exception as e:
+            if choice == "auto" and isinstance(self.backend, KeyboardBackend) and sys.platform.startswith("linux"):
+                # The keyboard module needs root on Linux; evdev only needs
+                # access to /dev/input
+                self.logger.warning(f"keyboard backend unavailable ({e}), trying evdev")
+                try:
+                    self.backend = create_backend("evdev")
+                    self.backend.start(self.dispatcher.on_key)
+                except Exception as e:
+                    self.backend = None
+                    self.logger.error(f"Failed to start hotkey backend: {e}")
+                    return False
+            else:
+                self.backend = None
+                self.logger.error(f"Failed to start {choice} hotkey backend: {e}")
+                return False
+        self.logger.info(f"Hotkey backend: {self.backend.name}")
+        return True
+
+    def stop_backend(self):
+        if self.backend is not None:
+            self.backend.stop()
+            self.backend = None
+
+    def configured_bindings(self):
+        bindings = []
         hotkey = self.config.get_setting("hotkey")
-        if not hotkey:
+        if hotkey:
+            bindings.append((hotkey, "toggle", None, False))
+        else:
             self.logger.warning("No hotkey configured.")
+        actions = self.config.get_setting("action_hotkeys") or {}
+        for action in ("hold", "opacity_up", "opacity_down", "spread", "hit_marker"):
+            if actions.get(action):
+                bindings.append((actions[action], action, None, action in ("hold", "spread")))
+        for hotkey, name in (self.config.get_setting("profile_hotkeys") or {}).items():
+            if name not in self.prepared_profiles:
+                self.logger.warning(f"Hotkey {hotkey} is bound to unknown profile {name}")
+                continue
+            bindings.append((hotkey, "profile", name, False))
+        return bindings
+
+    def register_hotkeys(self):
+        # One global hook; rebinding only swaps the dispatch table
+        if not self.start_backend():
             return
-        try:
-            if self.registered_hotkey:
-                keyboard.remove_hotkey(self.registered_hotkey)
-            self.registered_hotkey = keyboard.add_hotkey(hotkey, self.toggle_overlay)
-            self.logger.info(f"Registered global hotkey: {hotkey}")
-        except Exception as e:
-            self.logger.error(f"Failed to register hotkey {hotkey}: {e}")
+        bindings = self.configured_bindings()
+        rejected = self.dispatcher.build(bindings)
+        for hotkey, error in rejected:
+            self.logger.error(f"Failed to register hotkey {hotkey}: {error}")
+        self.logger.info(f"Registered {len(bindings) - len(rejected)} hotkeys")
 
-    def toggle_overlay(self):
-        if not self.overlay_window:
-            # Lazy import to avoid circular dependency
-            from ui.overlay_window import OverlayWindow
-            self.overlay_window = OverlayWindow(self.config)
-        if self.overlay_window.isVisible():
-            self.overlay_window.hide()
-            self.logger.info("Overlay hidden")
+    def prepare_profiles(self):
+        # Parse, validate and rasterize every hotkey-bound profile now so
+        # that switching is a dict lookup plus an in-memory model update.
+        if self.profile_store is None:
+            return
+        bindings = self.config.get_setting("profile_hotkeys") or {}
+        self.prepared_profiles = self.profile_store.prepare(set(bindings.values()))
+        if self.overlay_manager:
+            from ui.crosshair_cache import crosshair_cache
+            from ui.crosshair_renderer import CrosshairSpec
+            dprs = self.overlay_manager.device_pixel_ratios()
+            # Re-preparing replaces the previous set of bound profiles
+            crosshair_cache.unpin_all()
+            for values in self.prepared_profiles.values():
+                spec = CrosshairSpec.from_settings(values)
+                for dpr in dprs:
+                    crosshair_cache.pin(spec, dpr)
+        self.logger.info(f"Prepared {len(self.prepared_profiles)} hotkey profiles")
+
+    def on_action(self, action, argument, pressed, pressed_at):
+        # Time spent crossing from the listener thread to the GUI thread
+        _dispatch_timer.observe_since(pressed_at)
+        if action == "hold":
+            self.hold_overlay(pressed, pressed_at)
+        elif action == "spread":
+            self.overlay_manager.set_spread(pressed)
+        elif not pressed:
+            return
+        elif action == "toggle":
+            self.toggle_overlay(pressed_at)
+        elif action == "profile":
+            self.switch_profile(argument, pressed_at)
+        elif action == "opacity_up":
+            self.adjust_opacity(OPACITY_STEP)
+        elif action == "opacity_down":
+            self.adjust_opacity(-OPACITY_STEP)
+        elif action == "hit_marker":
+            self.overlay_manager.trigger_hit_marker()
+
+    def switch_profile(self, name, pressed_at=0.0):
+        values = self.prepared_profiles.get(name)
+        if values is None:
+            # Not bound to a hotkey: fall back to loading it on demand
+            if self.profile_store is None or name not in self.profile_store:
+                self.logger.warning(f"Unknown profile: {name}")
+                return
+            values = self.profile_store.get(name)
+        if self.overlay_manager:
+            # Blend to the new spec first; the model update below then finds
+            # the overlay already on it and does not snap
+            from ui.crosshair_renderer import CrosshairSpec
+            merged = {**self.config.crosshair.as_dict(), **values}
+            self.overlay_manager.cross_fade_to(CrosshairSpec.from_settings(merged))
+        self.config.crosshair.update(values)
+        self.config.set_setting("active_profile", name)
+        if pressed_at:
+            self.logger.debug("Switched to profile %s in %.2f ms", name, (time.perf_counter() - pressed_at) * 1000.0)
         else:
-            self.overlay_window.fade_in()
+            self.logger.info(f"Switched to profile {name}")
+
+    def toggle_overlay(self, pressed_at=0.0):
+        if not self.overlay_manager:
+            self.prepare_overlay()
+        if self.overlay_manager.toggle_visible(pressed_at or None):
             self.logger.info("Overlay shown")
+        else:
+            self.logger.info("Overlay hidden")
+
+    def hold_overlay(self, pressed, pressed_at=0.0):
+        # Shows the overlay while the key is held, unless it was already on
+        if not self.overlay_manager:
+            self.prepare_overlay()
+        if pressed:
+            if not self.overlay_manager.is_shown():
+                self.overlay_manager.fade_in(pressed_at or None)
+                self.hold_revealed = True
+        elif self.hold_revealed:
+            self.hold_revealed = False
+            self.overlay_manager.fade_out()
+
+    def adjust_opacity(self, step):
+        opacity = self.config.crosshair.get("opacity", 0.8)
+        opacity = round(min(1.0, max(0.1, opacity + step)), 2)
+        self.config.crosshair.update({"opacity": opacity})
+
+    def on_overlay_presented(self, pressed_at):
+        latency_ms = (time.perf_counter() - pressed_at) * 1000.0
+        self.press_to_visible.record(latency_ms)
+        self.logger.debug("Hotkey press to visible: %.2f ms", latency_ms)
+
+    def latency_stats(self):
+        return self.press_to_visible.summary()
 
     def update_hotkey(self, new_hotkey):
-        self.config.set_setting("hotkey", new_hotkey)
-        self.register_hotkey()
+        # Raises ValueError for a hotkey that cannot be bound or is taken
+        combo = parse_combo(new_hotkey)
+        hotkey = format_combo(combo)
+        for other, action, argument, _ in self.configured_bindings():
+            if action == "toggle":
+                continue
+            try:
+                taken = parse_combo(other) == combo
+            except ValueError:
+                continue
+            if taken:
+                raise ValueError(f"{hotkey} is already bound to {argument or action}")
+        self.config.set_setting("hotkey", hotkey)
+        self.register_hotkeys()
+        return hotkey
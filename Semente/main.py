@@ -1,39 +1,184 @@
+import time
+STARTED_AT = time.perf_counter()
+
+import argparse
 import sys
-import logging
-from PyQt5.QtWidgets import QApplication
-from ui.main_window import MainWindow
-from config.config_manager import ConfigManager
-from hotkey.hotkey_manager import HotkeyManager
-from tray.system_tray import SystemTray
-from utils.logger import setup_logger
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Semente crosshair overlay")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="print a per-phase startup timing breakdown")
+    parser.add_argument("--overlay-only", action="store_true",
+                        help="start without building the editor window")
+    parser.add_argument("--metrics-port", type=int,
+                        help="serve metrics on http://127.0.0.1:PORT/metrics")
+    parser.add_argument("--record-session", metavar="PATH",
+                        help="record editor edits and hotkey actions for bench/session_replay.py")
+    parser.add_argument("command", nargs="*",
+                        help="command for the running instance: toggle, show, hide, ui, hit, "
+                             "profile NAME or set FIELD=VALUE ...")
+    return parser.parse_known_args(argv)[0]
+
+def forward_command(command):
+    # Hand the command to the instance that owns the control socket
+    from control.instance_socket import send_command
+    try:
+        reply = send_command(command)
+    except OSError as e:
+        print(f"Semente is already running but did not answer: {e}", file=sys.stderr)
+        return 1
+    print(reply)
+    return 0 if reply.startswith("ok") else 1
 
 def main():
+    args = parse_args(sys.argv[1:])
+    command = " ".join(args.command)
+
+    # Single instance: whoever binds the control socket runs the app, any
+    # later launch only forwards its command, before Qt is even imported.
+    from control.instance_socket import InstanceListener
+    listener = InstanceListener()
+    if not listener.bind():
+        sys.exit(forward_command(command or "ui"))
+
+    from utils.startup_profiler import StartupProfiler
+    profiler = StartupProfiler(enabled=args.profile_startup, started_at=STARTED_AT)
+
     # Setup logger
-    logger = setup_logger()
+    with profiler.phase("logger"):
+        from utils.logger import set_log_level, setup_logger
+        logger = setup_logger()
     logger.info("Starting Semente application")
 
     # Load configuration
-    config = ConfigManager()
-    try:
-        config.load_config()
-        logger.info("Configuration loaded successfully")
-    except Exception as e:
-        logger.error(f"Failed to load configuration: {e}")
+    with profiler.phase("config load"):
+        from config.config_manager import ConfigManager
+        from config.profile_store import ProfileStore
+        config = ConfigManager()
+        try:
+            config.load_config()
+            logger.info("Configuration loaded successfully")
+        except Exception as e:
+            logger.error(f"Failed to load configuration: {e}")
+        try:
+            set_log_level(config.get_setting("log_level") or "INFO")
+        except ValueError as e:
+            logger.warning(f"Ignoring log_level setting: {e}")
+        # Only the index is read here; profiles are parsed when prepared
+        profile_store = ProfileStore()
+        profile_store.load_index()
 
     # Create Qt application
-    app = QApplication(sys.argv)
+    with profiler.phase("QApplication"):
+        from PyQt5.QtCore import QTimer
+        from PyQt5.QtWidgets import QApplication
+        app = QApplication(sys.argv)
+        # Persist any coalesced setting changes before the process exits
+        app.aboutToQuit.connect(config.close)
 
-    # Create main window
-    main_window = MainWindow(config)
-    main_window.show()
+    # The editor is built on first use; skip it entirely when only the
+    # overlay is wanted.
+    with profiler.phase("window build"):
+        from ui.window_host import MainWindowHost
+        main_window = MainWindowHost(config, profile_store)
+        if not args.overlay_only and not config.get_setting("game_ready_mode"):
+            main_window.show()
 
     # Setup hotkey manager
-    hotkey_manager = HotkeyManager(config, main_window)
-    hotkey_manager.register_hotkey()
+    with profiler.phase("hotkey register"):
+        from hotkey.hotkey_manager import HotkeyManager
+        hotkey_manager = HotkeyManager(config, main_window, profile_store=profile_store)
+        hotkey_manager.prepare_overlay()
+        main_window.set_overlay(hotkey_manager.overlay_manager)
+        main_window.set_hotkey_manager(hotkey_manager)
+        hotkey_manager.prepare_profiles()
+        hotkey_manager.register_hotkeys()
+        app.aboutToQuit.connect(hotkey_manager.stop_backend)
+    profiler.mark("first hotkey ready")
+
+    if args.record_session:
+        from ui.session_recorder import SessionRecorder
+        recorder = SessionRecorder(args.record_session)
+        recorder.attach_hotkeys(hotkey_manager)
+        main_window.window_built.connect(recorder.attach_window)
+        if main_window.window is not None:
+            recorder.attach_window(main_window.window)
+        app.aboutToQuit.connect(recorder.save)
+
+    from ui.game_ready_mode import GameReadyMode
+    game_ready_mode = GameReadyMode(config, main_window)
+    if config.get_setting("game_ready_mode"):
+        game_ready_mode.enter()
+
+    # Apply hand edits and provisioning changes to settings.json live
+    from ui.config_reloader import ConfigReloader
+    reloader = ConfigReloader(config)
+    def rebind_hotkeys(keys):
+        if "hotkey_backend" in keys:
+            hotkey_manager.stop_backend()
+        hotkey_manager.prepare_profiles()
+        hotkey_manager.register_hotkeys()
+    def apply_log_level(keys):
+        level = config.get_setting("log_level") or "INFO"
+        if game_ready_mode.active:
+            # Takes effect when Game Ready Mode is left
+            game_ready_mode.saved_log_level = level
+        else:
+            set_log_level(level)
+    def apply_game_ready_mode(keys):
+        if config.get_setting("game_ready_mode"):
+            game_ready_mode.enter()
+        else:
+            game_ready_mode.leave(show_editor=False)
+    reloader.on(("hotkey", "action_hotkeys", "profile_hotkeys", "hotkey_backend"), rebind_hotkeys)
+    reloader.on(("hotkey", "active_profile"), lambda keys: main_window.refresh_settings())
+    reloader.on(("overlay_screens",), lambda keys: hotkey_manager.overlay_manager.sync_screens())
+    reloader.on(("animation",), lambda keys: hotkey_manager.overlay_manager.apply_animation_settings())
+    reloader.on(("dynamic",), lambda keys: hotkey_manager.overlay_manager.apply_dynamic_settings())
+    reloader.on(("adaptive_contrast",), lambda keys: hotkey_manager.overlay_manager.apply_contrast_settings())
+    reloader.on(("log_level",), apply_log_level)
+    reloader.on(("game_ready_mode",), apply_game_ready_mode)
+    reloader.start()
+    app.aboutToQuit.connect(reloader.stop)
+    # Inotify costs nothing while idle; polling slows down but keeps running
+    # so "game_ready_mode": false in settings.json still ends the mode
+    normal_poll_interval = reloader.watcher.poll_interval
+    def slow_config_polling():
+        reloader.watcher.poll_interval = max(normal_poll_interval, 5.0)
+    def restore_config_polling():
+        reloader.watcher.poll_interval = normal_poll_interval
+    game_ready_mode.register_suspendable("config polling", slow_config_polling, restore_config_polling)
+
+    # Commands from later launches, scripts and stream-deck tools
+    from control.control_server import ControlServer, default_commands
+    control_server = ControlServer(listener, default_commands(config, main_window, hotkey_manager))
+    control_server.start()
+    app.aboutToQuit.connect(listener.stop)
+    if command:
+        QTimer.singleShot(0, lambda: logger.info(f"Startup command: {control_server.run(command)}"))
+
+    # Local metrics endpoint, off unless a port is configured
+    metrics_port = args.metrics_port or config.get_setting("metrics_port")
+    if metrics_port:
+        from utils.metrics import MetricsServer
+        metrics_server = MetricsServer(metrics_port)
+        if metrics_server.start():
+            app.aboutToQuit.connect(metrics_server.stop)
+            game_ready_mode.register_suspendable("metrics endpoint", metrics_server.stop, metrics_server.start)
 
-    # Setup system tray
-    tray = SystemTray(app, main_window, config)
-    tray.setup_tray()
+    # The tray is not needed to use the overlay, so it is set up once the
+    # event loop is running.
+    tray = None
+    def setup_tray():
+        nonlocal tray
+        with profiler.phase("tray setup"):
+            from tray.qt_tray import create_tray
+            tray = create_tray(app, main_window, config, game_ready_mode)
+            if tray is not None:
+                tray.setup_tray()
+        profiler.mark("event loop running")
+        profiler.print_report()
+    QTimer.singleShot(0, setup_tray)
 
     # Run application event loop
     try:
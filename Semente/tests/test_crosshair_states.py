@@ -0,0 +1,73 @@
+import os
+import sys
+import tempfile
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtWidgets import QApplication
+
+from config.config_manager import ConfigManager
+from ui.crosshair_states import STEP_MS
+from ui.overlay_window import OverlayWindow
+
+class SpreadSpecChangeTest(unittest.TestCase):
+    def setUp(self):
+        self.app = QApplication.instance() or QApplication(sys.argv[:1])
+        self.directory = tempfile.TemporaryDirectory()
+        self.config = ConfigManager(
+            config_path=os.path.join(self.directory.name, "settings.json"), write_behind=False
+        )
+        self.config.set_setting("dynamic", {**self.config.get_setting("dynamic"), "enabled": True})
+        self.overlay = OverlayWindow(self.config)
+        self.overlay.apply_dynamic_settings()
+        self.overlay.show()
+
+    def tearDown(self):
+        self.overlay.hide()
+        self.overlay.deleteLater()
+        self.config.close()
+        self.directory.cleanup()
+
+    def hold_spread(self):
+        dynamic = self.overlay.dynamic
+        dynamic.set_spread(True)
+        while dynamic.spread.is_active():
+            dynamic.spread.step(STEP_MS)
+        dynamic.timer.stop()
+        return dynamic
+
+    def test_spread_frame_survives_spec_change(self):
+        dynamic = self.hold_spread()
+        self.assertFalse(dynamic.is_active())
+        self.assertEqual(dynamic.spread.frame, dynamic.spread.keyframes - 1)
+
+        self.config.crosshair.update({"color": "#00FF00"})
+
+        pixmap = dynamic.base_pixmap()
+        self.assertIsNotNone(pixmap)
+        self.assertEqual(dynamic.spec, self.overlay.spec)
+        self.assertIs(pixmap, dynamic.spread_frames[dynamic.spread.frame])
+
+    def test_spread_frame_survives_retint(self):
+        dynamic = self.hold_spread()
+        self.overlay.contrast.picker.color = "#FFFFFF"
+        self.overlay.contrast.settings["enabled"] = True
+
+        self.overlay.retint()
+
+        self.assertIsNotNone(dynamic.base_pixmap())
+        self.assertEqual(dynamic.spec, self.overlay.spec)
+
+    def test_resting_spec_change_drops_keyframes(self):
+        dynamic = self.overlay.dynamic
+        dynamic.prepare(self.overlay.spec, self.overlay.devicePixelRatioF())
+
+        self.config.crosshair.update({"color": "#00FF00"})
+
+        self.assertEqual(dynamic.spread_frames, [])
+        self.assertIsNone(dynamic.base_pixmap())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import importlib.util
+import logging
+import time
+
+from PyQt5.QtWidgets import QAction, QMenu, QSystemTrayIcon
+
+from tray.tray_icon import tray_icon
+from utils.metrics import metrics
+
+_callback_timer = metrics.timer("tray.callback_ms")
+
+class QtSystemTray:
+    # Tray icon and menu on the Qt event loop itself: no extra thread, and
+    # every action already runs on the GUI thread.
+    def __init__(self, app, main_window, config, game_ready_mode, metrics_dump_path="metrics-dump.txt"):
+        self.app = app
+        self.main_window = main_window
+        self.config = config
+        self.game_ready_mode = game_ready_mode
+        self.metrics_dump_path = metrics_dump_path
+        self.icon = None
+        self.menu = None
+        self.logger = logging.getLogger("Semente.SystemTray")
+
+    def setup_tray(self):
+        self.menu = QMenu()
+        self.add_action("Show/Hide UI", self.toggle_ui)
+        self.game_ready_action = self.add_action("Game Ready Mode", self.toggle_game_ready_mode)
+        self.game_ready_action.setCheckable(True)
+        self.game_ready_action.setChecked(self.game_ready_mode.active)
+        self.game_ready_mode.changed.connect(self.game_ready_action.setChecked)
+        self.add_action("Dump metrics", self.dump_metrics)
+        self.menu.addSeparator()
+        self.add_action("Exit", self.exit_app)
+
+        self.icon = QSystemTrayIcon(tray_icon(), self.app)
+        self.icon.setToolTip("Semente")
+        self.icon.setContextMenu(self.menu)
+        self.icon.activated.connect(self.on_activated)
+        self.icon.show()
+        self.logger.info("System tray icon started")
+
+    def add_action(self, text, callback):
+        action = QAction(text, self.menu)
+        action.triggered.connect(lambda checked=False: self.timed(callback))
+        self.menu.addAction(action)
+        return action
+
+    def timed(self, callback):
+        started_at = time.perf_counter()
+        try:
+            callback()
+        finally:
+            _callback_timer.observe_since(started_at)
+
+    def on_activated(self, reason):
+        if reason == QSystemTrayIcon.Trigger:
+            self.timed(self.toggle_ui)
+
+    def toggle_ui(self):
+        self.main_window.toggle()
+        self.logger.info("Main window toggled via tray")
+
+    def toggle_game_ready_mode(self):
+        self.game_ready_mode.toggle()
+
+    def dump_metrics(self):
+        metrics.dump(self.metrics_dump_path, self.logger)
+
+    def exit_app(self):
+        self.logger.info("Exiting application via tray")
+        self.icon.hide()
+        self.app.quit()
+
+def create_tray(app, main_window, config, game_ready_mode):
+    # "tray_backend": "auto" (Qt when the desktop has a tray, else pystray),
+    # "qt", "pystray" or "none"
+    choice = config.get_setting("tray_backend") or "auto"
+    if choice == "none":
+        return None
+    if choice == "qt" or (choice == "auto" and QSystemTrayIcon.isSystemTrayAvailable()):
+        return QtSystemTray(app, main_window, config, game_ready_mode)
+    if choice == "auto" and importlib.util.find_spec("pystray") is None:
+        logging.getLogger("Semente.SystemTray").warning("No system tray available")
+        return None
+    from tray.system_tray import SystemTray
+    return SystemTray(app, main_window, config, game_ready_mode)
@@ -1,36 +1,49 @@
+import io
 import pystray
-from PIL import Image, ImageDraw
+from PIL import Image
 import threading
 import logging
+import time
+
+from PyQt5.QtCore import QMetaObject, Qt
+
+from tray.tray_icon import ICON_SIZES, icon_png_bytes
+from utils.metrics import metrics
+
+_callback_timer = metrics.timer("tray.callback_ms")
 
 class SystemTray:
-    def __init__(self, app, main_window, config):
+    # Fallback for desktops without a Qt-visible tray: pystray runs its own
+    # loop on a daemon thread, so every action is handed to the GUI thread.
+    def __init__(self, app, main_window, config, game_ready_mode, metrics_dump_path="metrics-dump.txt"):
         self.app = app
         self.main_window = main_window
         self.config = config
+        self.game_ready_mode = game_ready_mode
+        self.metrics_dump_path = metrics_dump_path
         self.icon = None
         self.logger = logging.getLogger("Semente.SystemTray")
 
-    def create_image(self, width=64, height=64, color1="#7F00FF", color2="#1C1C1C"):
-        # Create a simple purple seed icon
-        image = Image.new('RGBA', (width, height), color2)
-        draw = ImageDraw.Draw(image)
-        # Draw a circle with purple color
-        draw.ellipse((width*0.2, height*0.2, width*0.8, height*0.8), fill=color1)
-        # Draw a smaller black circle inside
-        draw.ellipse((width*0.4, height*0.4, width*0.6, height*0.6), fill=color2)
-        return image
+    def create_image(self, size=64):
+        # Reuses the icon cache shared with the Qt tray instead of drawing,
+        # but goes through memory so an unwritable cache directory is fine
+        size = size if size in ICON_SIZES else 64
+        return Image.open(io.BytesIO(icon_png_bytes(size)))
 
     def setup_tray(self):
         image = self.create_image()
         menu = pystray.Menu(
             pystray.MenuItem(
                 "Show/Hide UI",
-                self.toggle_ui
+                self.timed(self.toggle_ui)
             ),
             pystray.MenuItem(
                 "Toggle Game Ready Mode",
-                self.toggle_game_ready_mode
+                self.timed(self.toggle_game_ready_mode)
+            ),
+            pystray.MenuItem(
+                "Dump metrics",
+                self.timed(self.dump_metrics)
             ),
             pystray.MenuItem(
                 "Exit",
@@ -41,25 +54,31 @@ class SystemTray:
         threading.Thread(target=self.icon.run, daemon=True).start()
         self.logger.info("System tray icon started")
 
+    def timed(self, callback):
+        # pystray decides how to call an action from its argument count, so
+        # the wrapper keeps the explicit (icon, item) signature.
+        def run(icon, item):
+            started_at = time.perf_counter()
+            try:
+                callback(icon, item)
+            finally:
+                _callback_timer.observe_since(started_at)
+        return run
+
+    def dump_metrics(self, icon, item):
+        # Touches no widgets, so it can run on the tray thread
+        metrics.dump(self.metrics_dump_path, self.logger)
+
     def toggle_ui(self, icon, item):
-        if self.main_window.isVisible():
-            self.main_window.hide()
-            self.logger.info("Main window hidden via tray")
-        else:
-            self.main_window.show()
-            self.logger.info("Main window shown via tray")
+        # Runs on the tray thread; the window is shown or hidden on the GUI thread
+        self.main_window.toggle_requested.emit()
+        self.logger.info("Main window toggled via tray")
 
     def toggle_game_ready_mode(self, icon, item):
-        current = self.config.get_setting("game_ready_mode")
-        new_state = not current
-        self.config.set_setting("game_ready_mode", new_state)
-        self.logger.info(f"Game Ready Mode set to {new_state}")
-        if new_state:
-            self.main_window.hide()
-        else:
-            self.main_window.show()
+        # Runs on the tray thread; the mode switch happens on the GUI thread
+        self.game_ready_mode.toggle_requested.emit()
 
     def exit_app(self, icon, item):
         self.logger.info("Exiting application via tray")
         self.icon.stop()
-        self.app.quit()
+        QMetaObject.invokeMethod(self.app, "quit", Qt.QueuedConnection)
@@ -0,0 +1,63 @@
+import logging
+import os
+
+from PyQt5.QtCore import QBuffer, QIODevice, QRectF, Qt
+from PyQt5.QtGui import QColor, QIcon, QImage, QPainter, QPixmap
+
+# Bump when the artwork changes so cached PNGs are redrawn
+ICON_VERSION = 1
+ICON_SIZES = (16, 20, 24, 32, 40, 48, 64, 128)
+SEED_COLOR = "#7F00FF"
+BACKGROUND_COLOR = "#1C1C1C"
+
+_icon = None
+
+def render_icon_image(size):
+    # The purple seed: a ring on a dark square, drawn at the exact pixel
+    # size so small tray sizes are not downscaled from a large bitmap
+    image = QImage(size, size, QImage.Format_ARGB32_Premultiplied)
+    image.fill(QColor(BACKGROUND_COLOR))
+    painter = QPainter(image)
+    painter.setRenderHint(QPainter.Antialiasing)
+    painter.setPen(Qt.NoPen)
+    painter.setBrush(QColor(SEED_COLOR))
+    painter.drawEllipse(QRectF(size * 0.2, size * 0.2, size * 0.6, size * 0.6))
+    painter.setBrush(QColor(BACKGROUND_COLOR))
+    painter.drawEllipse(QRectF(size * 0.4, size * 0.4, size * 0.2, size * 0.2))
+    painter.end()
+    return image
+
+def icon_path(size, cache_dir="cache/icons"):
+    return os.path.join(cache_dir, f"tray-v{ICON_VERSION}-{size}.png")
+
+def load_icon_image(size, cache_dir="cache/icons"):
+    path = icon_path(size, cache_dir)
+    image = QImage(path)
+    if not image.isNull():
+        return image
+    image = render_icon_image(size)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        if not image.save(path, "PNG"):
+            raise OSError(f"could not write {path}")
+    except OSError as e:
+        logging.getLogger("Semente.TrayIcon").warning(f"Failed to cache tray icon: {e}")
+    return image
+
+def icon_png_bytes(size, cache_dir="cache/icons"):
+    # PNG encoded in memory, for consumers that cannot take a QImage
+    buffer = QBuffer()
+    buffer.open(QIODevice.WriteOnly)
+    load_icon_image(size, cache_dir).save(buffer, "PNG")
+    return bytes(buffer.data())
+
+def tray_icon(cache_dir="cache/icons"):
+    # Every resolution is loaded from the PNG cache (drawn once on a cold
+    # cache) and the QIcon is shared for the life of the process
+    global _icon
+    if _icon is None:
+        icon = QIcon()
+        for size in ICON_SIZES:
+            icon.addPixmap(QPixmap.fromImage(load_icon_image(size, cache_dir)))
+        _icon = icon
+    return _icon
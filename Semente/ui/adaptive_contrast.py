@@ -0,0 +1,219 @@
+import logging
+import math
+import time
+
+from PyQt5.QtCore import QObject, QRect, QTimer
+from PyQt5.QtGui import QColor, QImage
+
+from config.config_manager import CONTRAST_DEFAULTS
+from utils.metrics import metrics
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+_sample_timer = metrics.timer("overlay.contrast_sample_ms")
+_retints = metrics.counter("overlay.contrast_retints")
+
+# Without NumPy only about this many pixels of a sample are looked at
+FALLBACK_SAMPLES = 1024
+
+def _srgb_to_linear(channel):
+    c = channel / 255.0
+    return c / 12.92 if c <= 0.04045 else ((c + 0.055) / 1.055) ** 2.4
+
+_LINEAR = [_srgb_to_linear(value) for value in range(256)]
+# Per-channel luminance contributions, indexed by the 8-bit channel value
+_WEIGHTS = (0.2126, 0.7152, 0.0722)
+if numpy is not None:
+    _LUTS = tuple(numpy.array([weight * value for value in _LINEAR], dtype=numpy.float32) for weight in _WEIGHTS)
+
+def relative_luminance(color):
+    color = QColor(color)
+    return (_WEIGHTS[0] * _LINEAR[color.red()] + _WEIGHTS[1] * _LINEAR[color.green()]
+            + _WEIGHTS[2] * _LINEAR[color.blue()])
+
+def contrast_ratio(a, b):
+    # WCAG contrast between two relative luminances, 1.0 to 21.0
+    return (max(a, b) + 0.05) / (min(a, b) + 0.05)
+
+def background_levels(image, hole=None):
+    # (dark, bright): the 10th and 90th percentile luminance of the image,
+    # leaving out the hole rectangle where the overlay itself is drawn.
+    if image.format() != QImage.Format_RGB32:
+        image = image.convertToFormat(QImage.Format_RGB32)
+    if numpy is not None:
+        return _levels_numpy(image, hole)
+    return _levels_python(image, hole)
+
+def _levels_numpy(image, hole):
+    width = image.width()
+    height = image.height()
+    bits = image.constBits()
+    bits.setsize(image.byteCount())
+    pixels = numpy.frombuffer(bits, numpy.uint32).reshape(height, image.bytesPerLine() // 4)[:, :width]
+    luminance = (_LUTS[0][(pixels >> 16) & 0xFF] + _LUTS[1][(pixels >> 8) & 0xFF]
+                 + _LUTS[2][pixels & 0xFF])
+    if hole is not None and not hole.isEmpty():
+        mask = numpy.ones((height, width), dtype=bool)
+        mask[max(0, hole.top()):max(0, hole.bottom() + 1), max(0, hole.left()):max(0, hole.right() + 1)] = False
+        luminance = luminance[mask]
+    if luminance.size == 0:
+        return None
+    dark, bright = numpy.percentile(luminance, (10, 90))
+    return float(dark), float(bright)
+
+def _levels_python(image, hole):
+    width = image.width()
+    height = image.height()
+    step = max(1, int(math.sqrt(width * height / FALLBACK_SAMPLES)))
+    values = []
+    for y in range(0, height, step):
+        for x in range(0, width, step):
+            if hole is not None and hole.contains(x, y):
+                continue
+            rgb = image.pixel(x, y)
+            values.append(_WEIGHTS[0] * _LINEAR[(rgb >> 16) & 0xFF] + _WEIGHTS[1] * _LINEAR[(rgb >> 8) & 0xFF]
+                          + _WEIGHTS[2] * _LINEAR[rgb & 0xFF])
+    if not values:
+        return None
+    values.sort()
+    last = len(values) - 1
+    return values[int(round(0.1 * last))], values[int(round(0.9 * last))]
+
+class ContrastPicker:
+    # Chooses the crosshair color for a background sample. color is None
+    # while the configured color is readable enough; otherwise the
+    # candidate with the best worst-case contrast. The hysteresis keeps a
+    # noisy background from flipping between two close choices.
+    def __init__(self, settings):
+        self.settings = {**CONTRAST_DEFAULTS, **settings}
+        self.candidates = {QColor(c).name().upper(): relative_luminance(c) for c in self.settings["colors"]}
+        self.color = None
+
+    def score(self, luminance, levels):
+        dark, bright = levels
+        return min(contrast_ratio(luminance, dark), contrast_ratio(luminance, bright))
+
+    def choose(self, preferred, levels):
+        min_contrast = self.settings["min_contrast"]
+        hysteresis = self.settings["hysteresis"]
+        preferred_score = self.score(relative_luminance(preferred), levels)
+        # Going back to the configured color needs a clear margin
+        threshold = min_contrast * (1.0 + hysteresis) if self.color is not None else min_contrast
+        if preferred_score >= threshold or not self.candidates:
+            return None
+        scores = {color: self.score(luminance, levels) for color, luminance in self.candidates.items()}
+        best = max(scores, key=scores.get)
+        current = scores.get(self.color)
+        if current is not None and current >= max(min_contrast, scores[best] * (1.0 - hysteresis)):
+            return self.color
+        if scores[best] <= preferred_score:
+            return None
+        return best
+
+    def update(self, preferred, image, hole=None):
+        # Returns True when the chosen color changed
+        levels = background_levels(image, hole)
+        if levels is None:
+            return False
+        color = self.choose(preferred, levels)
+        if color == self.color:
+            return False
+        self.color = color
+        return True
+
+class AdaptiveContrast(QObject):
+    # Samples the screen just around one OverlayWindow while it is shown
+    # and re-tints it when the background makes the configured color hard
+    # to see. The sampling interval stretches so the work stays within
+    # cpu_budget_pct of one core. grab(rect) returns a QImage of a global
+    # rectangle already clipped to the screen; it can be replaced to feed
+    # synthetic backgrounds.
+    def __init__(self, widget, config, grab=None):
+        super().__init__(widget)
+        self.widget = widget
+        self.config = config
+        self.grab = grab or self.grab_screen
+        self.logger = logging.getLogger("Semente.AdaptiveContrast")
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.tick)
+        self.cost_ms = 0.0
+        self.apply_settings()
+
+    def apply_settings(self):
+        self.settings = {**CONTRAST_DEFAULTS, **(self.config.get_setting("adaptive_contrast") or {})}
+        self.picker = ContrastPicker(self.settings)
+        self.cost_ms = 0.0
+        if numpy is None and self.enabled:
+            self.logger.info("NumPy not available, sampling a subset of pixels")
+
+    @property
+    def enabled(self):
+        return bool(self.settings["enabled"])
+
+    @property
+    def color(self):
+        return self.picker.color
+
+    def tint(self, spec):
+        if not self.enabled or self.picker.color is None:
+            return spec
+        return spec.tinted(self.picker.color)
+
+    def start(self):
+        if self.enabled and self.widget.isVisible() and not self.timer.isActive():
+            self.timer.start(0)
+
+    def stop(self):
+        self.timer.stop()
+
+    def screen(self):
+        return self.widget.target_screen or self.widget.screen()
+
+    def sample_rect(self):
+        # The overlay plus the margin ring, clipped to its screen
+        margin = int(self.settings["margin_px"])
+        rect = self.widget.frameGeometry().adjusted(-margin, -margin, margin, margin)
+        screen = self.screen()
+        return rect.intersected(screen.geometry()) if screen is not None else rect
+
+    def grab_screen(self, rect):
+        screen = self.screen()
+        if screen is None or rect.isEmpty():
+            return None
+        geometry = screen.geometry()
+        return screen.grabWindow(0, rect.x() - geometry.x(), rect.y() - geometry.y(),
+                                 rect.width(), rect.height()).toImage()
+
+    def hole_rect(self, rect, scale):
+        # Where the overlay itself lies in the grabbed image, in its pixels
+        hole = self.widget.frameGeometry().translated(-rect.x(), -rect.y())
+        return QRect(int(round(hole.x() * scale)), int(round(hole.y() * scale)),
+                     int(round(hole.width() * scale)), int(round(hole.height() * scale)))
+
+    def tick(self):
+        started_at = time.perf_counter()
+        cpu_started = time.thread_time()
+        rect = self.sample_rect()
+        image = self.grab(rect)
+        if image is not None and not image.isNull():
+            # The grab is in device pixels
+            hole = self.hole_rect(rect, image.width() / max(1, rect.width()))
+            if self.picker.update(self.config.crosshair.color, image, hole):
+                _retints.inc()
+                self.logger.debug(f"Adaptive color: {self.picker.color or 'configured'}")
+                self.widget.retint()
+        _sample_timer.observe_since(started_at)
+        cost_ms = (time.thread_time() - cpu_started) * 1000.0
+        self.cost_ms = cost_ms if not self.cost_ms else 0.8 * self.cost_ms + 0.2 * cost_ms
+        if self.widget.isVisible():
+            self.timer.start(self.interval_ms())
+
+    def interval_ms(self):
+        # The rate cap, or longer if a sample costs more than the budget allows
+        floor_ms = 1000.0 / max(0.1, float(self.settings["rate_hz"]))
+        budget = max(0.01, float(self.settings["cpu_budget_pct"])) / 100.0
+        return int(math.ceil(max(floor_ms, self.cost_ms / budget)))
@@ -0,0 +1,51 @@
+import logging
+import time
+
+from PyQt5.QtCore import QObject, Qt, pyqtSignal
+
+from config.config_watcher import ConfigWatcher
+from utils.metrics import metrics
+
+_apply_timer = metrics.timer("config.reload_apply_ms")
+
+class ConfigReloader(QObject):
+    # Applies external edits of settings.json on the GUI thread. The watcher
+    # thread hands over an already parsed dict; crosshair fields reach the
+    # overlay and editor through the model's subscriptions, and every other
+    # changed key runs the handlers registered for it.
+    settings_loaded = pyqtSignal(object)
+
+    def __init__(self, config, debounce_ms=250):
+        super().__init__()
+        self.config = config
+        self.handlers = []
+        self.logger = logging.getLogger("Semente.ConfigReloader")
+        self.watcher = ConfigWatcher(
+            config.config_path, self.settings_loaded.emit, config.is_own_write, debounce_ms
+        )
+        self.settings_loaded.connect(self.apply, Qt.QueuedConnection)
+
+    def on(self, keys, handler):
+        # handler(changed_keys) runs once per reload touching any of keys
+        self.handlers.append((frozenset(keys), handler))
+
+    def start(self):
+        self.watcher.start()
+
+    def stop(self):
+        self.watcher.stop()
+
+    def apply(self, settings):
+        started_at = time.perf_counter()
+        changed = self.config.apply_external(settings)
+        if not changed:
+            return
+        for keys, handler in self.handlers:
+            relevant = changed & keys
+            if relevant:
+                try:
+                    handler(relevant)
+                except Exception as e:
+                    self.logger.error(f"Failed to apply reloaded {', '.join(sorted(relevant))}: {e}")
+        _apply_timer.observe_since(started_at)
+        self.logger.info(f"Reloaded settings: {', '.join(sorted(changed))}")
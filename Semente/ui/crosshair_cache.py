@@ -0,0 +1,72 @@
+from collections import OrderedDict
+import logging
+
+from PyQt5.QtGui import QPixmap
+
+from ui.crosshair_renderer import compile_crosshair, pin_compiled, unpin_compiled
+
+class CrosshairCache:
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        # Pinned rasters live outside the LRU and are never evicted
+        self.pinned = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.logger = logging.getLogger("Semente.CrosshairCache")
+
+    def make_key(self, spec, dpr):
+        return (spec.key, round(float(dpr), 3))
+
+    def get(self, spec, dpr=1.0):
+        key = self.make_key(spec, dpr)
+        pixmap = self.pinned.get(key)
+        if pixmap is not None:
+            self.hits += 1
+            return pixmap
+        pixmap = self.entries.get(key)
+        if pixmap is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return pixmap
+
+        self.misses += 1
+        image = compile_crosshair(spec).render_image(dpr)
+        pixmap = QPixmap.fromImage(image)
+        self.entries[key] = pixmap
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+        return pixmap
+
+    def pin(self, spec, dpr=1.0):
+        pin_compiled(spec)
+        self.pinned[self.make_key(spec, dpr)] = self.get(spec, dpr)
+
+    def unpin_all(self):
+        self.pinned.clear()
+        unpin_compiled()
+
+    def draw_centered(self, painter, center_x, center_y, pixmap):
+        # Blit a cached raster so that its center lands on (center_x, center_y)
+        half = int(round(pixmap.width() / pixmap.devicePixelRatioF())) // 2
+        painter.drawPixmap(center_x - half, center_y - half, pixmap)
+
+    def clear(self):
+        self.entries.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "pinned": len(self.pinned),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+# Shared by CrosshairPreview and OverlayWindow so both reuse the same rasters
+crosshair_cache = CrosshairCache()
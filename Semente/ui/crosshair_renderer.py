@@ -0,0 +1,225 @@
+from collections import OrderedDict
+import math
+
+from PyQt5.QtCore import Qt, QPointF, QRect, QRectF
+from PyQt5.QtGui import QColor, QImage, QPainter, QPainterPath, QPainterPathStroker
+
+from config.crosshair_model import CROSSHAIR_TYPES
+
+
+class CrosshairLayer:
+    __slots__ = (
+        "type", "color", "thickness", "size", "gap", "dot",
+        "outline", "outline_color", "outline_thickness", "key"
+    )
+
+    def __init__(self, type="Cross", color="#7F00FF", thickness=2, size=20, gap=0,
+                 dot=False, outline=False, outline_color="#000000", outline_thickness=1):
+        self.type = type if type in CROSSHAIR_TYPES else "Cross"
+        self.color = QColor(color).rgba()
+        self.thickness = max(1, int(thickness))
+        self.size = max(0, int(size))
+        self.gap = max(0, min(int(gap), self.size))
+        self.dot = bool(dot)
+        self.outline = bool(outline)
+        self.outline_color = QColor(outline_color).rgba()
+        self.outline_thickness = max(0, int(outline_thickness))
+        self.update_key()
+
+    def update_key(self):
+        self.key = (
+            self.type, self.color, self.thickness, self.size, self.gap, self.dot,
+            self.outline, self.outline_color, self.outline_thickness
+        )
+
+    def spread(self, pixels):
+        # A copy pushed outward: longer arms around a wider gap, or a larger
+        # circle/square. A point does not spread.
+        layer = CrosshairLayer.__new__(CrosshairLayer)
+        for name in self.__slots__:
+            setattr(layer, name, getattr(self, name))
+        if self.type != "Point":
+            layer.size = self.size + pixels
+            layer.gap = self.gap + pixels
+        layer.update_key()
+        return layer
+
+    def tinted(self, color):
+        # A copy in another color; shape and outline are unchanged
+        layer = CrosshairLayer.__new__(CrosshairLayer)
+        for name in self.__slots__:
+            setattr(layer, name, getattr(self, name))
+        layer.color = QColor(color).rgba()
+        layer.update_key()
+        return layer
+
+    @classmethod
+    def from_settings(cls, settings, defaults=None):
+        defaults = defaults or {}
+        def pick(name, fallback):
+            return settings.get(name, defaults.get(name, fallback))
+        return cls(
+            type=pick("type", "Cross"),
+            color=pick("color", "#7F00FF"),
+            thickness=pick("thickness", 2),
+            size=pick("size", 20),
+            gap=pick("gap", 0),
+            dot=pick("dot", False),
+            outline=pick("outline", False),
+            outline_color=pick("outline_color", "#000000"),
+            outline_thickness=pick("outline_thickness", 1)
+        )
+
+class CrosshairSpec:
+    __slots__ = ("layers", "opacity", "key")
+
+    def __init__(self, layers, opacity=0.8):
+        self.layers = tuple(layers)
+        self.opacity = round(max(0.0, min(float(opacity), 1.0)), 3)
+        self.key = (tuple(layer.key for layer in self.layers), self.opacity)
+
+    @classmethod
+    def from_settings(cls, crosshair):
+        # The top-level fields describe the base layer; "layers" stacks
+        # further layers on top of it, inheriting unspecified fields.
+        base = CrosshairLayer.from_settings(crosshair)
+        layers = [base]
+        for extra in crosshair.get("layers", ()):
+            layers.append(CrosshairLayer.from_settings(extra, crosshair))
+        return cls(layers, crosshair.get("opacity", 0.8))
+
+    def spread(self, pixels):
+        return CrosshairSpec([layer.spread(pixels) for layer in self.layers], self.opacity)
+
+    def tinted(self, color):
+        return CrosshairSpec([layer.tinted(color) for layer in self.layers], self.opacity)
+
+    @property
+    def base(self):
+        return self.layers[0]
+
+    def __eq__(self, other):
+        return isinstance(other, CrosshairSpec) and self.key == other.key
+
+    def __hash__(self):
+        return hash(self.key)
+
+def _stroke(path, width):
+    stroker = QPainterPathStroker()
+    stroker.setWidth(width)
+    # Matches the QPen defaults the widgets used to draw with
+    stroker.setCapStyle(Qt.SquareCap)
+    stroker.setJoinStyle(Qt.BevelJoin)
+    return stroker.createStroke(path)
+
+def _shape_path(layer):
+    # Line shapes are converted to their stroked outline up front so that
+    # painting is a plain fill with no per-frame stroking.
+    size = layer.size
+    gap = layer.gap
+    path = QPainterPath()
+    if layer.type == "Point":
+        half = layer.thickness / 2.0
+        path.addRect(QRectF(-half, -half, layer.thickness, layer.thickness))
+        return path
+    if layer.type == "Circle":
+        path.addEllipse(QPointF(0, 0), size, size)
+    elif layer.type == "Square":
+        path.addRect(QRectF(-size, -size, size * 2, size * 2))
+    elif gap:
+        for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+            path.moveTo(dx * gap, dy * gap)
+            path.lineTo(dx * size, dy * size)
+    else:
+        path.moveTo(-size, 0)
+        path.lineTo(size, 0)
+        path.moveTo(0, -size)
+        path.lineTo(0, size)
+    return _stroke(path, layer.thickness)
+
+def _dot_path(layer):
+    radius = max(1.0, layer.thickness / 2.0)
+    path = QPainterPath()
+    path.addEllipse(QPointF(0, 0), radius, radius)
+    return path
+
+class CompiledCrosshair:
+    __slots__ = ("spec", "ops", "bounding_rect", "extent")
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.ops = []
+        for layer in spec.layers:
+            body = _shape_path(layer)
+            if layer.dot:
+                body = body.united(_dot_path(layer))
+            if layer.outline and layer.outline_thickness:
+                outline = body.united(_stroke(body, layer.outline_thickness * 2))
+                self.ops.append((outline, QColor.fromRgba(layer.outline_color)))
+            self.ops.append((body, QColor.fromRgba(layer.color)))
+
+        rect = QRectF()
+        for path, _ in self.ops:
+            rect = rect.united(path.boundingRect())
+        self.bounding_rect = rect
+        # Logical edge of a square, centered raster holding every layer plus
+        # one pixel of antialiasing on each side.
+        reach = max(abs(rect.left()), abs(rect.right()), abs(rect.top()), abs(rect.bottom()), 0.5)
+        self.extent = 2 * int(math.ceil(reach)) + 2
+
+    def centered_rect(self, center_x, center_y):
+        # Device-independent rect the raster covers when centered on a point
+        half = self.extent // 2
+        return QRect(center_x - half, center_y - half, self.extent, self.extent)
+
+    def paint(self, painter, center_x, center_y):
+        # Draws the layers at full strength; the spec opacity is applied to
+        # the finished raster by render_image so overlapping layers do not
+        # show through each other.
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(Qt.NoPen)
+        painter.translate(center_x, center_y)
+        for path, color in self.ops:
+            painter.fillPath(path, color)
+        painter.restore()
+
+    def render_image(self, dpr=1.0):
+        pixels = int(math.ceil(self.extent * dpr))
+        image = QImage(pixels, pixels, QImage.Format_ARGB32_Premultiplied)
+        image.setDevicePixelRatio(dpr)
+        image.fill(Qt.transparent)
+
+        painter = QPainter(image)
+        self.paint(painter, self.extent / 2.0, self.extent / 2.0)
+        if self.spec.opacity < 1.0:
+            painter.setCompositionMode(QPainter.CompositionMode_DestinationIn)
+            painter.fillRect(QRectF(0, 0, self.extent, self.extent), QColor(0, 0, 0, int(round(self.spec.opacity * 255))))
+        painter.end()
+        return image
+
+_compiled = OrderedDict()
+_COMPILED_LIMIT = 128
+# Specs that must stay compiled regardless of LRU pressure (e.g. profiles
+# bound to hotkeys)
+_pinned = {}
+
+def compile_crosshair(spec):
+    compiled = _pinned.get(spec.key)
+    if compiled is not None:
+        return compiled
+    compiled = _compiled.get(spec.key)
+    if compiled is None:
+        compiled = CompiledCrosshair(spec)
+        _compiled[spec.key] = compiled
+        while len(_compiled) > _COMPILED_LIMIT:
+            _compiled.popitem(last=False)
+    else:
+        _compiled.move_to_end(spec.key)
+    return compiled
+
+def pin_compiled(spec):
+    _pinned[spec.key] = compile_crosshair(spec)
+
+def unpin_compiled():
+    _pinned.clear()
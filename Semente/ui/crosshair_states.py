@@ -0,0 +1,261 @@
+import logging
+import math
+import time
+
+from PyQt5.QtCore import QObject, QPointF, QRect, Qt, QTimer
+from PyQt5.QtGui import QColor, QImage, QPainter, QPainterPath, QPixmap
+
+from config.config_manager import DYNAMIC_DEFAULTS
+from ui.crosshair_cache import crosshair_cache
+from ui.crosshair_renderer import compile_crosshair
+from utils.metrics import metrics
+
+_step_timer = metrics.timer("overlay.dynamic_tick_ms")
+_skipped_steps = metrics.counter("overlay.dynamic_skipped_steps")
+
+# The simulation always advances in steps of this size; frames are only
+# painted when a step moved some state onto a different keyframe.
+STEP_MS = 1000.0 / 120.0
+MAX_STEPS_PER_TICK = 12
+
+def render_hit_marker(size, gap, thickness, color, dpr=1.0):
+    # Four diagonal ticks around the center, rasterized once per look
+    extent = 2 * int(math.ceil(gap + size + thickness)) + 2
+    pixels = int(math.ceil(extent * dpr))
+    image = QImage(pixels, pixels, QImage.Format_ARGB32_Premultiplied)
+    image.setDevicePixelRatio(dpr)
+    image.fill(Qt.transparent)
+    path = QPainterPath()
+    center = extent / 2.0
+    for dx, dy in ((1, 1), (1, -1), (-1, 1), (-1, -1)):
+        path.moveTo(QPointF(center + dx * gap, center + dy * gap))
+        path.lineTo(QPointF(center + dx * (gap + size), center + dy * (gap + size)))
+    painter = QPainter(image)
+    painter.setRenderHint(QPainter.Antialiasing)
+    pen = painter.pen()
+    pen.setColor(QColor(color))
+    pen.setWidthF(thickness)
+    pen.setCapStyle(Qt.FlatCap)
+    painter.setPen(pen)
+    painter.drawPath(path)
+    painter.end()
+    return QPixmap.fromImage(image)
+
+class SpreadState:
+    # Eases a 0..1 spread amount towards the target while the key is held
+    # or released, snapping the painted frame to one of the keyframes.
+    def __init__(self, in_ms, out_ms, keyframes):
+        self.in_ms = max(1.0, float(in_ms))
+        self.out_ms = max(1.0, float(out_ms))
+        self.keyframes = max(2, int(keyframes))
+        self.amount = 0.0
+        self.target = 0.0
+        self.frame = 0
+
+    def set_held(self, held):
+        self.target = 1.0 if held else 0.0
+
+    def is_active(self):
+        return self.amount != self.target
+
+    def step(self, step_ms):
+        if self.amount < self.target:
+            self.amount = min(self.target, self.amount + step_ms / self.in_ms)
+        elif self.amount > self.target:
+            self.amount = max(self.target, self.amount - step_ms / self.out_ms)
+        frame = int(round(self.amount * (self.keyframes - 1)))
+        changed = frame != self.frame
+        self.frame = frame
+        return changed
+
+class PulseState:
+    # A hit marker that fades out over duration_ms in a fixed number of
+    # opacity levels, so it repaints at most that many times per pulse.
+    def __init__(self, duration_ms, levels):
+        self.duration_ms = max(1.0, float(duration_ms))
+        self.levels = max(2, int(levels))
+        self.remaining_ms = 0.0
+        self.level = 0
+
+    def trigger(self):
+        self.remaining_ms = self.duration_ms
+        self.level = self.levels - 1
+
+    def is_active(self):
+        return self.remaining_ms > 0.0
+
+    def step(self, step_ms):
+        self.remaining_ms = max(0.0, self.remaining_ms - step_ms)
+        level = int(math.ceil(self.remaining_ms / self.duration_ms * (self.levels - 1)))
+        changed = level != self.level
+        self.level = level
+        return changed
+
+    def opacity(self):
+        return self.level / (self.levels - 1)
+
+class DynamicCrosshair(QObject):
+    # Spread and hit-marker states for one OverlayWindow. A fixed-timestep
+    # scheduler advances them; only keyframe changes are painted, only
+    # inside the rectangles they touch, and the timer stops once every
+    # state is at rest.
+    def __init__(self, widget, config):
+        super().__init__(widget)
+        self.widget = widget
+        self.config = config
+        self.logger = logging.getLogger("Semente.DynamicCrosshair")
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.tick)
+        self.last_tick = 0.0
+        self.accumulated_ms = 0.0
+        self.interval_ms = 1000.0 / 60.0
+        self.spec = None
+        self.dpr = None
+        self.spread_frames = []
+        self.hit_marker = None
+        self.apply_settings()
+
+    def apply_settings(self):
+        self.settings = {**DYNAMIC_DEFAULTS, **(self.config.get_setting("dynamic") or {})}
+        self.spread = SpreadState(
+            self.settings["spread_in_ms"], self.settings["spread_out_ms"], self.settings["keyframes"]
+        )
+        self.pulse = PulseState(self.settings["hit_marker_ms"], self.settings["keyframes"])
+        self.invalidate()
+
+    @property
+    def enabled(self):
+        return bool(self.settings["enabled"])
+
+    def invalidate(self):
+        self.spec = None
+        self.spread_frames = []
+        self.hit_marker = None
+
+    def spec_changed(self, spec, dpr):
+        # Keyframes are rebuilt right away while something is moving or a
+        # spread frame or hit marker is still drawn; otherwise on the next
+        # prerender or trigger
+        if self.is_active() or self.is_showing():
+            self.prepare(spec, dpr)
+        else:
+            self.invalidate()
+
+    def spread_specs(self, spec):
+        frames = self.spread.keyframes
+        pixels = self.settings["spread_px"]
+        return [spec.spread(int(round(pixels * i / (frames - 1)))) for i in range(frames)]
+
+    def extent(self, spec):
+        # Logical size the overlay window needs to hold every keyframe
+        if not self.enabled:
+            return 0
+        widest = compile_crosshair(spec.spread(self.settings["spread_px"])).extent
+        s = self.settings
+        marker = 2 * int(math.ceil(s["hit_marker_gap"] + s["hit_marker_size"] + s["hit_marker_thickness"])) + 2
+        return max(widest, marker)
+
+    def prepare(self, spec, dpr):
+        # Pre-render every keyframe so animating is blitting only
+        if not self.enabled:
+            return
+        if spec == self.spec and dpr == self.dpr and self.spread_frames:
+            return
+        self.spec = spec
+        self.dpr = dpr
+        self.spread_frames = [crosshair_cache.get(frame, dpr) for frame in self.spread_specs(spec)]
+        s = self.settings
+        self.hit_marker = render_hit_marker(
+            s["hit_marker_size"], s["hit_marker_gap"], s["hit_marker_thickness"], s["hit_marker_color"], dpr
+        )
+
+    def is_active(self):
+        return self.spread.is_active() or self.pulse.is_active()
+
+    def is_showing(self):
+        return self.spread.frame != 0 or self.pulse.level != 0
+
+    def set_spread(self, held):
+        if not self.enabled or not self.widget.isVisible():
+            return
+        self.spread.set_held(held)
+        self.wake()
+
+    def trigger_hit_marker(self):
+        if not self.enabled or not self.widget.isVisible():
+            return
+        self.pulse.trigger()
+        self.wake()
+        self.widget.update(self.pixmap_rect(self.hit_marker))
+
+    def wake(self):
+        self.prepare(self.widget.spec, self.widget.devicePixelRatioF())
+        if self.is_active() and not self.timer.isActive():
+            self.interval_ms = 1000.0 / self.widget.fade.refresh_rate()
+            self.accumulated_ms = 0.0
+            self.last_tick = time.perf_counter()
+            self.timer.start(int(self.interval_ms))
+
+    def tick(self):
+        now = time.perf_counter()
+        self.accumulated_ms += (now - self.last_tick) * 1000.0
+        self.last_tick = now
+        steps = int(self.accumulated_ms // STEP_MS)
+        if steps > MAX_STEPS_PER_TICK:
+            # After a long stall, catch up in one jump instead of spinning
+            _skipped_steps.inc(steps - MAX_STEPS_PER_TICK)
+            self.accumulated_ms = MAX_STEPS_PER_TICK * STEP_MS
+            steps = MAX_STEPS_PER_TICK
+        self.accumulated_ms -= steps * STEP_MS
+
+        damage = QRect()
+        spread_frame = self.spread.frame
+        for _ in range(steps):
+            self.spread.step(STEP_MS)
+        if self.spread.frame != spread_frame:
+            damage = damage.united(self.pixmap_rect(self.spread_frames[spread_frame]))
+            damage = damage.united(self.pixmap_rect(self.spread_frames[self.spread.frame]))
+        pulse_level = self.pulse.level
+        for _ in range(steps):
+            if not self.pulse.is_active():
+                break
+            self.pulse.step(STEP_MS)
+        if self.pulse.level != pulse_level:
+            damage = damage.united(self.pixmap_rect(self.hit_marker))
+        if not damage.isEmpty():
+            self.widget.update(damage)
+        _step_timer.observe_since(now)
+
+        if self.is_active():
+            delay_ms = self.interval_ms - (time.perf_counter() - now) * 1000.0
+            self.timer.start(max(0, int(math.ceil(delay_ms))))
+
+    def pixmap_rect(self, pixmap):
+        # Widget rect a centered pixmap covers
+        if pixmap is None:
+            return QRect()
+        side = int(math.ceil(pixmap.width() / pixmap.devicePixelRatioF()))
+        half = side // 2
+        return QRect(self.widget.width() // 2 - half, self.widget.height() // 2 - half, side, side)
+
+    def base_pixmap(self):
+        # The keyframe to draw instead of the static raster, if spread
+        if self.spread_frames and self.spread.frame:
+            return self.spread_frames[self.spread.frame]
+        return None
+
+    def paint_over(self, painter, center_x, center_y):
+        if self.hit_marker is not None and self.pulse.level:
+            painter.save()
+            painter.setOpacity(self.pulse.opacity())
+            crosshair_cache.draw_centered(painter, center_x, center_y, self.hit_marker)
+            painter.restore()
+
+    def stop(self):
+        self.timer.stop()
+        self.spread.amount = self.spread.target = 0.0
+        self.spread.frame = 0
+        self.pulse.remaining_ms = 0.0
+        self.pulse.level = 0
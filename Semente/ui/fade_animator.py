@@ -0,0 +1,135 @@
+import logging
+import math
+
+from PyQt5.QtCore import QElapsedTimer, QEasingCurve, QObject, Qt, QTimer, pyqtSignal
+
+EASINGS = {
+    "Linear": QEasingCurve.Linear,
+    "InQuad": QEasingCurve.InQuad,
+    "OutQuad": QEasingCurve.OutQuad,
+    "InOutQuad": QEasingCurve.InOutQuad,
+    "InCubic": QEasingCurve.InCubic,
+    "OutCubic": QEasingCurve.OutCubic,
+    "InOutCubic": QEasingCurve.InOutCubic,
+    "InOutSine": QEasingCurve.InOutSine,
+    "OutExpo": QEasingCurve.OutExpo
+}
+
+class FadeAnimator(QObject):
+    # Emitted with the run's frame statistics when a fade completes
+    finished = pyqtSignal(dict)
+
+    def __init__(self, widget, apply, duration_ms=800, easing="OutCubic"):
+        super().__init__(widget)
+        self.widget = widget
+        self.apply = apply
+        self.duration_ms = duration_ms
+        self.easing = easing
+        self.logger = logging.getLogger("Semente.FadeAnimator")
+
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.on_frame)
+        self.clock = QElapsedTimer()
+
+        self.curve = []
+        self.value = 0.0
+        self.index = 0
+        self.interval_ms = 1000.0 / 60.0
+        self.on_done = None
+        self.running = False
+        self.stats = {}
+        self.last_stats = {}
+
+    def refresh_rate(self):
+        screen = self.widget.screen()
+        rate = screen.refreshRate() if screen else 0.0
+        return rate if rate >= 24.0 else 60.0
+
+    def build_curve(self, start, end, frames):
+        easing = QEasingCurve(EASINGS.get(self.easing, QEasingCurve.OutCubic))
+        return [start + (end - start) * easing.valueForProgress(i / frames) for i in range(frames + 1)]
+
+    def is_running(self):
+        return self.running
+
+    def start(self, start, end, full_range=1.0, on_done=None):
+        # A fade that interrupts another continues from the current value
+        # and only takes the share of the duration it still has to cover.
+        interrupted = self.is_running()
+        if interrupted:
+            self.timer.stop()
+            start = self.value
+        distance = abs(end - start)
+        duration_ms = self.duration_ms * (distance / full_range if full_range else 1.0)
+
+        self.interval_ms = 1000.0 / self.refresh_rate()
+        frames = max(1, int(round(duration_ms / self.interval_ms)))
+        self.curve = self.build_curve(start, end, frames)
+        self.index = 0
+        self.on_done = on_done
+        self.stats = {
+            "expected_frames": frames,
+            "frames": 0,
+            "dropped_frames": 0,
+            "late_frames": 0,
+            "interrupted_previous": interrupted,
+            "refresh_hz": round(1000.0 / self.interval_ms, 2),
+            "target_duration_ms": round(frames * self.interval_ms, 2),
+            "duration_ms": 0.0
+        }
+
+        self.value = self.curve[0]
+        self.apply(self.value)
+        if duration_ms <= 0:
+            self.clock.invalidate()
+            self.finish()
+            return
+        self.clock.start()
+        self.running = True
+        self.schedule_next()
+
+    def schedule_next(self):
+        # Aim each tick at the start of the next frame slot so the timer
+        # stays phase-locked to the refresh interval instead of drifting.
+        elapsed_ms = self.clock.nsecsElapsed() / 1e6
+        delay_ms = (self.index + 1) * self.interval_ms - elapsed_ms
+        self.timer.start(max(0, int(math.ceil(delay_ms))))
+
+    def on_frame(self):
+        elapsed_ms = self.clock.nsecsElapsed() / 1e6
+        due_index = min(len(self.curve) - 1, int(elapsed_ms / self.interval_ms))
+        if due_index <= self.index:
+            self.schedule_next()
+            return
+        skipped = due_index - self.index - 1
+        if skipped:
+            self.stats["dropped_frames"] += skipped
+        # Late: this frame arrived more than half an interval after its slot
+        if elapsed_ms - due_index * self.interval_ms > self.interval_ms / 2:
+            self.stats["late_frames"] += 1
+        self.index = due_index
+        self.stats["frames"] += 1
+        self.value = self.curve[due_index]
+        self.apply(self.value)
+        if due_index == len(self.curve) - 1:
+            self.finish()
+        else:
+            self.schedule_next()
+
+    def stop(self):
+        self.timer.stop()
+        self.running = False
+
+    def finish(self):
+        self.timer.stop()
+        self.running = False
+        self.stats["duration_ms"] = round(self.clock.nsecsElapsed() / 1e6, 2) if self.clock.isValid() else 0.0
+        self.last_stats = self.stats
+        self.logger.debug("Fade finished: %s", self.stats)
+        on_done = self.on_done
+        self.on_done = None
+        if on_done:
+            on_done()
+        self.finished.emit(self.stats)
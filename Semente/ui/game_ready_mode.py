@@ -0,0 +1,141 @@
+import gc
+import logging
+import time
+
+from PyQt5.QtCore import QObject, Qt, pyqtSignal
+
+from utils.logger import get_log_level, set_log_level
+from utils.process_stats import (cpu_time_seconds, current_rss_bytes, format_bytes,
+                                 lower_priority, restore_priority, trim_heap)
+
+class GameReadyMode(QObject):
+    # While active only the overlay and the hotkeys stay alive: the editor is
+    # destroyed (taking its idle timer and thumbnail pool with it), work
+    # registered by main.py is suspended, logging drops to warnings and the
+    # process runs at a lower scheduling priority.
+    changed = pyqtSignal(bool)
+    toggle_requested = pyqtSignal()
+
+    def __init__(self, config, main_window):
+        super().__init__()
+        self.config = config
+        self.main_window = main_window
+        self.active = False
+        self.suspendables = {}
+        self.saved_log_level = None
+        self.saved_priority = None
+        self.entered_at = None
+        self.entered_cpu = None
+        # CPU rate outside the mode, measured from the last time it was left
+        self.normal_since = (time.perf_counter(), cpu_time_seconds())
+        self.logger = logging.getLogger("Semente.GameReadyMode")
+        # Callable from any thread, e.g. the tray's
+        self.toggle_requested.connect(self.toggle, Qt.QueuedConnection)
+
+    def register_suspendable(self, name, suspend, resume):
+        # suspend/resume pairs for timers and workers the overlay can do without
+        self.suspendables[name] = (suspend, resume)
+        if self.active:
+            suspend()
+
+    def unregister_suspendable(self, name):
+        self.suspendables.pop(name, None)
+
+    def toggle(self):
+        if self.active:
+            self.leave()
+        else:
+            self.enter()
+
+    def enter(self):
+        if self.active:
+            return
+        now = time.perf_counter()
+        cpu_now = cpu_time_seconds()
+        normal_rate = self.cpu_rate(self.normal_since, now, cpu_now)
+        rss_before = current_rss_bytes()
+
+        self.main_window.destroy()
+        for name, (suspend, resume) in self.suspendables.items():
+            try:
+                suspend()
+            except Exception as e:
+                self.logger.error(f"Failed to suspend {name}: {e}")
+        # Say it before the level drops, otherwise nobody sees it
+        self.logger.info("Entering Game Ready Mode")
+        self.saved_log_level = get_log_level()
+        set_log_level("WARNING")
+        # After a failed restore this is still the priority from before the
+        # first enter, so the target does not drift lower each time
+        lowered = lower_priority(self.saved_priority)
+        if lowered is not None:
+            self.saved_priority = lowered
+        gc.collect()
+        trim_heap()
+
+        self.active = True
+        self.entered_at = time.perf_counter()
+        self.entered_cpu = cpu_time_seconds()
+        if not self.config.get_setting("game_ready_mode"):
+            self.config.set_setting("game_ready_mode", True)
+        rss_after = current_rss_bytes()
+        # Reported at WARNING so it survives the lowered log level
+        self.logger.warning(
+            f"Game Ready Mode on: RSS {format_bytes(rss_before)} -> {format_bytes(rss_after)}"
+            f" ({self.format_saved(rss_before, rss_after)} freed),"
+            f" CPU before {normal_rate:.2f}%"
+        )
+        self.changed.emit(True)
+
+    def leave(self, show_editor=True):
+        if not self.active:
+            return
+        now = time.perf_counter()
+        cpu_now = cpu_time_seconds()
+        mode_rate = self.cpu_rate((self.entered_at, self.entered_cpu), now, cpu_now)
+        normal_rate = self.cpu_rate(self.normal_since, self.entered_at, self.entered_cpu)
+        rss_in_mode = current_rss_bytes()
+
+        self.active = False
+        if self.saved_log_level is not None:
+            set_log_level(self.saved_log_level)
+            self.saved_log_level = None
+        for name, (suspend, resume) in self.suspendables.items():
+            try:
+                resume()
+            except Exception as e:
+                self.logger.error(f"Failed to resume {name}: {e}")
+        # Last, so nothing above depends on it succeeding
+        try:
+            restored = restore_priority(self.saved_priority)
+        except Exception as e:
+            self.logger.error(f"Failed to restore the process priority: {e}")
+            restored = False
+        if restored:
+            self.saved_priority = None
+        else:
+            self.logger.warning("Could not restore the process priority")
+        self.config.set_setting("game_ready_mode", False)
+        if show_editor:
+            self.main_window.show()
+
+        self.logger.info(
+            f"Game Ready Mode off after {now - self.entered_at:.0f} s: CPU {mode_rate:.2f}%"
+            f" in mode vs {normal_rate:.2f}% before, RSS in mode {format_bytes(rss_in_mode)},"
+            f" now {format_bytes(current_rss_bytes())}"
+        )
+        self.normal_since = (time.perf_counter(), cpu_time_seconds())
+        self.changed.emit(False)
+
+    def cpu_rate(self, since, now, cpu_now):
+        # Process CPU time as a percentage of one core over the interval
+        started_at, cpu_started = since
+        elapsed = now - started_at
+        if elapsed <= 0:
+            return 0.0
+        return (cpu_now - cpu_started) / elapsed * 100.0
+
+    def format_saved(self, before, after):
+        if before is None or after is None:
+            return "n/a"
+        return format_bytes(max(0, before - after))
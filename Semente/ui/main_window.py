@@ -1,9 +1,19 @@
+import time
+
 from PyQt5.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox,
-    QSlider, QPushButton, QColorDialog, QTabWidget, QFrame, QLineEdit, QMessageBox
+    QSlider, QPushButton, QColorDialog, QTabWidget, QFrame, QLineEdit, QMessageBox,
+    QCheckBox, QInputDialog
 )
-from PyQt5.QtCore import Qt, pyqtSignal
-from PyQt5.QtGui import QColor, QPainter, QPen, QFont
+from PyQt5.QtCore import Qt, QRect, QTimer, pyqtSignal
+from PyQt5.QtGui import QColor, QPainter, QFont
+from hotkey.bindings import format_combo, parse_combo
+from ui.crosshair_cache import crosshair_cache
+from ui.crosshair_renderer import CrosshairSpec, compile_crosshair
+from ui.styles import EDITOR_OBJECT_NAME, apply_app_style_sheet
+from utils.metrics import metrics
+
+_preview_paint_timer = metrics.timer("preview.paint_ms")
 
 class CrosshairPreview(QWidget):
     def __init__(self, parent=None):
@@ -13,90 +23,87 @@ class CrosshairPreview(QWidget):
         self.thickness = 2
         self.size = 20
         self.opacity = 0.8
+        # Composite style fields (gap, dot, outline, layers, ...)
+        self.style_options = {}
+        self.spec = None
+        self.painted_rect = QRect()
         self.setMinimumSize(200, 200)
         self.setMaximumSize(400, 400)
 
     def set_crosshair_type(self, crosshair_type):
         self.crosshair_type = crosshair_type
-        self.update()
+        self.invalidate()
 
     def set_color(self, color):
         self.color = color
-        self.update()
+        self.invalidate()
 
     def set_thickness(self, thickness):
         self.thickness = thickness
-        self.update()
+        self.invalidate()
 
     def set_size(self, size):
         self.size = size
-        self.update()
+        self.invalidate()
 
     def set_opacity(self, opacity):
         self.opacity = opacity
-        self.update()
+        self.invalidate()
+
+    def set_style_option(self, name, value):
+        self.style_options[name] = value
+        self.invalidate()
+
+    def invalidate(self):
+        # Repaint only the union of the old and new crosshair footprints
+        self.spec = None
+        compiled = compile_crosshair(self.current_spec())
+        rect = compiled.centered_rect(self.width() // 2, self.height() // 2)
+        self.update(rect.united(self.painted_rect))
+        self.painted_rect = rect
+
+    def current_spec(self):
+        if self.spec is None:
+            self.spec = CrosshairSpec.from_settings({
+                **self.style_options,
+                "type": self.crosshair_type,
+                "color": self.color.name(QColor.HexArgb),
+                "thickness": self.thickness,
+                "size": self.size,
+                "opacity": self.opacity
+            })
+        return self.spec
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        compiled = compile_crosshair(self.current_spec())
+        self.painted_rect = compiled.centered_rect(self.width() // 2, self.height() // 2)
 
     def paintEvent(self, event):
+        started_at = time.perf_counter()
         painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
-        painter.setOpacity(self.opacity)
-        pen = QPen(self.color)
-        pen.setWidth(self.thickness)
-        painter.setPen(pen)
-
-        center_x = self.width() // 2
-        center_y = self.height() // 2
-        size = self.size
-
-        if self.crosshair_type == "Point":
-            painter.drawPoint(center_x, center_y)
-        elif self.crosshair_type == "Cross":
-            painter.drawLine(center_x - size, center_y, center_x + size, center_y)
-            painter.drawLine(center_x, center_y - size, center_x, center_y + size)
-        elif self.crosshair_type == "Circle":
-            painter.drawEllipse(center_x - size, center_y - size, size * 2, size * 2)
-        elif self.crosshair_type == "Square":
-            painter.drawRect(center_x - size, center_y - size, size * 2, size * 2)
-        else:
-            # Default to cross
-            painter.drawLine(center_x - size, center_y, center_x + size, center_y)
-            painter.drawLine(center_x, center_y - size, center_x, center_y + size)
+        pixmap = crosshair_cache.get(self.current_spec(), self.devicePixelRatioF())
+        crosshair_cache.draw_centered(painter, self.width() // 2, self.height() // 2, pixmap)
+        painter.end()
+        _preview_paint_timer.observe_since(started_at)
 
 class MainWindow(QMainWindow):
     settings_changed = pyqtSignal()
+    # User edits, before they are applied; used by the session recorder
+    field_edited = pyqtSignal(str, object)
+    profile_selected = pyqtSignal(str)
 
-    def __init__(self, config):
+    def __init__(self, config, profile_store=None):
         super().__init__()
         self.config = config
+        self.profile_store = profile_store
+        self.overlay = None
+        self.hotkey_manager = None
+        self.awaiting_animation_stats = False
         self.setWindowTitle("Semente - Crosshair Customizer")
         self.setFixedSize(600, 400)
-        self.setStyleSheet("""
-            QMainWindow {
-                background-color: #0F0F0F;
-                color: white;
-                font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            }
-            QLabel {
-                color: #CCCCCC;
-                font-size: 14px;
-            }
-            QComboBox, QSlider, QPushButton, QLineEdit {
-                background-color: #1C1C1C;
-                color: white;
-                border: 1px solid #7F00FF;
-                border-radius: 4px;
-            }
-            QSlider::handle:horizontal {
-                background: #7F00FF;
-                border-radius: 8px;
-                width: 16px;
-                margin: -4px 0;
-            }
-            QPushButton:hover {
-                background-color: #7F00FF;
-                color: black;
-            }
-        """)
+        self.setObjectName(EDITOR_OBJECT_NAME)
+        apply_app_style_sheet()
 
         self.init_ui()
         self.load_settings()
@@ -104,25 +111,32 @@ class MainWindow(QMainWindow):
     def init_ui(self):
         main_layout = QHBoxLayout()
         sidebar = QTabWidget()
-        sidebar.setStyleSheet("""
-            QTabBar::tab {
-                background: #1C1C1C;
-                color: #CCCCCC;
-                padding: 10px;
-                border-top-left-radius: 8px;
-                border-top-right-radius: 8px;
-                min-width: 100px;
-            }
-            QTabBar::tab:selected {
-                background: #7F00FF;
-                color: white;
-            }
-        """)
+        self.sidebar = sidebar
+        # Only the Editor tab is built up front; the others are filled in the
+        # first time they are selected.
+        self.tab_builders = {}
 
         # Editor Tab
         editor_tab = QWidget()
         editor_layout = QVBoxLayout()
 
+        # Profiles
+        profile_row = QHBoxLayout()
+        profile_label = QLabel("Profile:")
+        self.profile_combo = QComboBox()
+        self.profile_combo.activated[str].connect(self.on_profile_selected)
+        self.save_profile_button = QPushButton("Save As...")
+        self.save_profile_button.clicked.connect(self.save_profile)
+        self.delete_profile_button = QPushButton("Delete")
+        self.delete_profile_button.clicked.connect(self.delete_profile)
+        profile_row.addWidget(profile_label)
+        profile_row.addWidget(self.profile_combo, 1)
+        profile_row.addWidget(self.save_profile_button)
+        profile_row.addWidget(self.delete_profile_button)
+        if self.profile_store is None:
+            for widget in (self.profile_combo, self.save_profile_button, self.delete_profile_button):
+                widget.setEnabled(False)
+
         # Crosshair Type
         type_label = QLabel("Crosshair Type:")
         self.type_combo = QComboBox()
@@ -156,12 +170,30 @@ class MainWindow(QMainWindow):
         self.opacity_slider.setMaximum(100)
         self.opacity_slider.valueChanged.connect(self.on_opacity_changed)
 
+        # Composite style options
+        gap_label = QLabel("Center Gap:")
+        self.gap_slider = QSlider(Qt.Horizontal)
+        self.gap_slider.setMinimum(0)
+        self.gap_slider.setMaximum(20)
+        self.gap_slider.valueChanged.connect(self.on_gap_changed)
+        self.dot_checkbox = QCheckBox("Center Dot")
+        self.dot_checkbox.toggled.connect(self.on_dot_toggled)
+        self.outline_checkbox = QCheckBox("Outline")
+        self.outline_checkbox.toggled.connect(self.on_outline_toggled)
+
         # Hotkey Input
         hotkey_label = QLabel("Toggle Hotkey:")
         self.hotkey_input = QLineEdit()
         self.hotkey_input.setPlaceholderText("Press a key")
-        self.hotkey_input.setMaxLength(10)
+        self.hotkey_input.setMaxLength(32)
         self.hotkey_input.textChanged.connect(self.on_hotkey_changed)
+        self.hotkey_input.editingFinished.connect(self.apply_hotkey)
+        # Typing "ctrl+shift+f10" passes through several partial hotkeys;
+        # only the text that settles is validated and registered
+        self.hotkey_timer = QTimer(self)
+        self.hotkey_timer.setSingleShot(True)
+        self.hotkey_timer.setInterval(600)
+        self.hotkey_timer.timeout.connect(self.apply_hotkey)
 
         # Animation Test Button
         self.test_animation_button = QPushButton("Test Fade-in Animation")
@@ -171,6 +203,7 @@ class MainWindow(QMainWindow):
         self.preview = CrosshairPreview()
 
         # Add widgets to layout
+        editor_layout.addLayout(profile_row)
         editor_layout.addWidget(type_label)
         editor_layout.addWidget(self.type_combo)
         editor_layout.addWidget(color_label)
@@ -181,6 +214,10 @@ class MainWindow(QMainWindow):
         editor_layout.addWidget(self.size_slider)
         editor_layout.addWidget(opacity_label)
         editor_layout.addWidget(self.opacity_slider)
+        editor_layout.addWidget(gap_label)
+        editor_layout.addWidget(self.gap_slider)
+        editor_layout.addWidget(self.dot_checkbox)
+        editor_layout.addWidget(self.outline_checkbox)
         editor_layout.addWidget(hotkey_label)
         editor_layout.addWidget(self.hotkey_input)
         editor_layout.addWidget(self.test_animation_button)
@@ -190,80 +227,262 @@ class MainWindow(QMainWindow):
         editor_tab.setLayout(editor_layout)
         sidebar.addTab(editor_tab, "Editor")
 
-        # Settings Tab (placeholder)
-        settings_tab = QWidget()
+        self.gallery = None
+        self.add_lazy_tab("Gallery", self.build_gallery_tab)
+        self.add_lazy_tab("Settings", self.build_settings_tab)
+        self.add_lazy_tab("About", self.build_about_tab)
+        sidebar.currentChanged.connect(self.on_tab_changed)
+
+        main_layout.addWidget(sidebar)
+        container = QWidget()
+        container.setLayout(main_layout)
+        self.setCentralWidget(container)
+
+    def add_lazy_tab(self, title, builder):
+        index = self.sidebar.addTab(QWidget(), title)
+        self.tab_builders[index] = builder
+
+    def on_tab_changed(self, index):
+        builder = self.tab_builders.pop(index, None)
+        if builder is not None:
+            builder(self.sidebar.widget(index))
+
+    def build_gallery_tab(self, gallery_tab):
+        gallery_layout = QVBoxLayout()
+        if self.profile_store is None:
+            gallery_layout.addWidget(QLabel("Profiles are not available."))
+        else:
+            from ui.preset_gallery import PresetGallery
+            self.gallery = PresetGallery(self.profile_store)
+            self.gallery.preset_activated.connect(self.on_gallery_preset)
+            gallery_layout.addWidget(self.gallery)
+        gallery_tab.setLayout(gallery_layout)
+
+    def on_gallery_preset(self, name):
+        self.on_profile_selected(name)
+        self.set_control(self.profile_combo, self.profile_combo.setCurrentText, name)
+
+    def build_settings_tab(self, settings_tab):
+        # Placeholder
         settings_layout = QVBoxLayout()
         settings_label = QLabel("Settings will be here.")
         settings_layout.addWidget(settings_label)
         settings_tab.setLayout(settings_layout)
-        sidebar.addTab(settings_tab, "Settings")
 
-        # About Tab
-        about_tab = QWidget()
+    def build_about_tab(self, about_tab):
         about_layout = QVBoxLayout()
         about_text = QLabel("Semente - Crosshair Overlay App\nVersion 1.0\n© 2024")
         about_text.setAlignment(Qt.AlignCenter)
         about_layout.addWidget(about_text)
         about_tab.setLayout(about_layout)
-        sidebar.addTab(about_tab, "About")
-
-        main_layout.addWidget(sidebar)
-        container = QWidget()
-        container.setLayout(main_layout)
-        self.setCentralWidget(container)
 
     def load_settings(self):
         try:
-            crosshair = self.config.get_setting("crosshair")
-            if crosshair:
-                self.type_combo.setCurrentText(crosshair.get("type", "Cross"))
-                self.color_button.setStyleSheet(f"background-color: {crosshair.get('color', '#7F00FF')}")
-                self.preview.set_color(QColor(crosshair.get("color", "#7F00FF")))
-                self.thickness_slider.setValue(crosshair.get("thickness", 2))
-                self.size_slider.setValue(crosshair.get("size", 20))
-                self.opacity_slider.setValue(int(crosshair.get("opacity", 0.8) * 100))
-                self.preview.set_thickness(crosshair.get("thickness", 2))
-                self.preview.set_size(crosshair.get("size", 20))
-                self.preview.set_opacity(crosshair.get("opacity", 0.8))
-            hotkey = self.config.get_setting("hotkey")
-            if hotkey:
-                self.hotkey_input.setText(hotkey)
+            self.apply_crosshair_changes(self.config.crosshair.as_dict())
+            # Keep the editor in sync with changes made anywhere else
+            self.crosshair_subscription = self.config.crosshair.subscribe(self.apply_crosshair_changes)
+            self.refresh_settings()
         except Exception as e:
             QMessageBox.warning(self, "Error", f"Failed to load settings: {e}")
 
+    def refresh_settings(self):
+        # Non-crosshair settings shown in the editor; crosshair fields
+        # arrive through the model subscription
+        hotkey = self.config.get_setting("hotkey")
+        if hotkey:
+            self.set_control(self.hotkey_input, self.hotkey_input.setText, hotkey)
+            self.set_input_error(self.hotkey_input, None)
+        self.refresh_profiles()
+
+    def set_control(self, widget, setter, value):
+        # Update a control without re-emitting it back into the model
+        widget.blockSignals(True)
+        setter(value)
+        widget.blockSignals(False)
+
+    def apply_crosshair_changes(self, changes):
+        for field, value in changes.items():
+            if field == "type":
+                self.preview.set_crosshair_type(value)
+                self.set_control(self.type_combo, self.type_combo.setCurrentText, value)
+            elif field == "color":
+                self.preview.set_color(QColor(value))
+                self.color_button.setStyleSheet(f"background-color: {value}")
+            elif field == "thickness":
+                self.preview.set_thickness(value)
+                self.set_control(self.thickness_slider, self.thickness_slider.setValue, value)
+            elif field == "size":
+                self.preview.set_size(value)
+                self.set_control(self.size_slider, self.size_slider.setValue, value)
+            elif field == "opacity":
+                self.preview.set_opacity(value)
+                self.set_control(self.opacity_slider, self.opacity_slider.setValue, int(round(value * 100)))
+            else:
+                self.preview.set_style_option(field, value)
+                if field == "gap":
+                    self.set_control(self.gap_slider, self.gap_slider.setValue, value)
+                elif field == "dot":
+                    self.set_control(self.dot_checkbox, self.dot_checkbox.setChecked, value)
+                elif field == "outline":
+                    self.set_control(self.outline_checkbox, self.outline_checkbox.setChecked, value)
+
+    def set_crosshair_field(self, field, value):
+        self.field_edited.emit(field, value)
+        try:
+            self.config.crosshair.set(field, value)
+        except ValueError as e:
+            QMessageBox.warning(self, "Error", f"Invalid {field}: {e}")
+
     def on_type_changed(self, text):
-        self.preview.set_crosshair_type(text)
-        self.config.set_setting("crosshair", {**self.config.get_setting("crosshair"), "type": text})
-        self.settings_changed.emit()
+        self.set_crosshair_field("type", text)
 
     def open_color_dialog(self):
         color = QColorDialog.getColor(initial=self.preview.color, parent=self, options=QColorDialog.ShowAlphaChannel)
         if color.isValid():
-            self.preview.set_color(color)
-            self.color_button.setStyleSheet(f"background-color: {color.name()}")
-            self.config.set_setting("crosshair", {**self.config.get_setting("crosshair"), "color": color.name()})
-            self.settings_changed.emit()
+            self.set_crosshair_field("color", color.name())
 
     def on_thickness_changed(self, value):
-        self.preview.set_thickness(value)
-        self.config.set_setting("crosshair", {**self.config.get_setting("crosshair"), "thickness": value})
-        self.settings_changed.emit()
+        self.set_crosshair_field("thickness", value)
 
     def on_size_changed(self, value):
-        self.preview.set_size(value)
-        self.config.set_setting("crosshair", {**self.config.get_setting("crosshair"), "size": value})
-        self.settings_changed.emit()
+        self.set_crosshair_field("size", value)
 
     def on_opacity_changed(self, value):
-        opacity = value / 100.0
-        self.preview.set_opacity(opacity)
-        self.config.set_setting("crosshair", {**self.config.get_setting("crosshair"), "opacity": opacity})
-        self.settings_changed.emit()
+        self.set_crosshair_field("opacity", value / 100.0)
+
+    def on_gap_changed(self, value):
+        self.set_crosshair_field("gap", value)
+
+    def on_dot_toggled(self, checked):
+        self.set_crosshair_field("dot", checked)
+
+    def on_outline_toggled(self, checked):
+        self.set_crosshair_field("outline", checked)
 
     def on_hotkey_changed(self, text):
-        self.config.set_setting("hotkey", text)
+        self.hotkey_timer.start()
+
+    def apply_hotkey(self):
+        self.hotkey_timer.stop()
+        text = self.hotkey_input.text()
+        try:
+            if self.hotkey_manager is not None:
+                hotkey = self.hotkey_manager.update_hotkey(text)
+            else:
+                hotkey = format_combo(parse_combo(text))
+                self.config.set_setting("hotkey", hotkey)
+        except ValueError as e:
+            self.set_input_error(self.hotkey_input, str(e))
+            return
+        self.set_input_error(self.hotkey_input, None)
         self.settings_changed.emit()
 
+    def set_input_error(self, widget, message):
+        # Styled by the [invalid="true"] rule of the shared style sheet
+        invalid = message is not None
+        widget.setToolTip(message or "")
+        if widget.property("invalid") != invalid:
+            widget.setProperty("invalid", invalid)
+            widget.style().unpolish(widget)
+            widget.style().polish(widget)
+
+    def refresh_profiles(self):
+        if self.profile_store is None:
+            return
+        self.profile_combo.blockSignals(True)
+        self.profile_combo.clear()
+        self.profile_combo.addItems(self.profile_store.names())
+        active = self.config.get_setting("active_profile")
+        if active in self.profile_store:
+            self.profile_combo.setCurrentText(active)
+        else:
+            self.profile_combo.setCurrentIndex(-1)
+        self.profile_combo.blockSignals(False)
+        if self.gallery is not None:
+            self.gallery.reload()
+
+    def on_profile_selected(self, name):
+        self.profile_selected.emit(name)
+        try:
+            if self.hotkey_manager is not None:
+                # Same path as a profile hotkey, including the cross-fade
+                self.hotkey_manager.switch_profile(name)
+                return
+            self.config.crosshair.update(self.profile_store.get(name))
+            self.config.set_setting("active_profile", name)
+        except Exception as e:
+            QMessageBox.warning(self, "Error", f"Failed to load profile {name}: {e}")
+
+    def save_profile(self):
+        name, ok = QInputDialog.getText(self, "Save Profile", "Profile name:", text=self.profile_combo.currentText())
+        name = name.strip()
+        if not ok or not name:
+            return
+        try:
+            self.profile_store.save(name, self.config.crosshair.as_dict())
+            self.config.set_setting("active_profile", name)
+        except Exception as e:
+            QMessageBox.warning(self, "Error", f"Failed to save profile {name}: {e}")
+        self.refresh_prepared_profile(name)
+        self.refresh_profiles()
+
+    def delete_profile(self):
+        name = self.profile_combo.currentText()
+        if not name:
+            return
+        if QMessageBox.question(self, "Delete Profile", f"Delete profile {name}?") != QMessageBox.Yes:
+            return
+        self.profile_store.delete(name)
+        if self.config.get_setting("active_profile") == name:
+            self.config.set_setting("active_profile", None)
+        self.refresh_prepared_profile(name)
+        self.refresh_profiles()
+
+    def refresh_prepared_profile(self, name):
+        # Profile hotkeys switch to values prepared ahead of time; re-prepare
+        # them when one of those profiles was saved or deleted
+        bound = (self.config.get_setting("profile_hotkeys") or {}).values()
+        if self.hotkey_manager is not None and name in bound:
+            self.hotkey_manager.prepare_profiles()
+
+    def set_overlay(self, overlay):
+        self.overlay = overlay
+        overlay.fade_finished.connect(self.on_animation_finished)
+
+    def set_hotkey_manager(self, hotkey_manager):
+        self.hotkey_manager = hotkey_manager
+
+    def teardown(self):
+        # Drop every reference held from outside the window so it can be freed
+        self.hotkey_timer.stop()
+        subscription = getattr(self, "crosshair_subscription", None)
+        if subscription is not None:
+            self.config.crosshair.unsubscribe(subscription)
+            self.crosshair_subscription = None
+        if self.overlay is not None:
+            self.overlay.fade_finished.disconnect(self.on_animation_finished)
+            self.overlay = None
+        if self.gallery is not None:
+            self.gallery.shutdown()
+
     def test_animation(self):
-        # Emit signal or call method to trigger fade-in animation on overlay
-        QMessageBox.information(self, "Animation", "Fade-in animation test triggered.")
+        if self.overlay is None:
+            QMessageBox.information(self, "Animation", "The overlay is not available yet.")
+            return
+        # Replay the fade from fully hidden so every run is comparable
+        self.awaiting_animation_stats = True
+        self.overlay.restart_fade()
+
+    def on_animation_finished(self, stats):
+        if not self.awaiting_animation_stats:
+            return
+        self.awaiting_animation_stats = False
+        QMessageBox.information(
+            self, "Animation",
+            "Fade-in finished.\n\n"
+            f"Refresh rate: {stats['refresh_hz']:.0f} Hz\n"
+            f"Duration: {stats['duration_ms']:.0f} ms (target {stats['target_duration_ms']:.0f} ms)\n"
+            f"Frames: {stats['frames']} of {stats['expected_frames']}\n"
+            f"Dropped frames: {stats['dropped_frames']}\n"
+            f"Late frames: {stats['late_frames']}"
+        )
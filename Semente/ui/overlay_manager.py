@@ -0,0 +1,204 @@
+import logging
+
+from PyQt5.QtCore import QObject, pyqtSignal
+from PyQt5.QtGui import QGuiApplication
+
+from ui.overlay_window import OverlayWindow
+
+class OverlayManager(QObject):
+    # Same contract as OverlayWindow.presented, emitted once per fade_in
+    presented = pyqtSignal(float)
+    # Frame statistics of the primary overlay's fades
+    fade_finished = pyqtSignal(dict)
+
+    def __init__(self, config):
+        super().__init__()
+        self.config = config
+        self.logger = logging.getLogger("Semente.OverlayManager")
+        self.overlays = {}
+        self.spares = []
+        # screen name -> (geometry, device pixel ratio) as last applied
+        self.screen_cache = {}
+        self.watched_screens = set()
+        self.pending_press = None
+        self.shown = False
+
+        app = QGuiApplication.instance()
+        app.screenAdded.connect(self.on_screen_added)
+        app.screenRemoved.connect(self.on_screen_removed)
+        app.primaryScreenChanged.connect(lambda screen: self.sync_screens())
+        self.sync_screens()
+
+    def target_screens(self):
+        # "overlay_screens" is "primary", "all", a screen name or a list of
+        # screen names.
+        choice = self.config.get_setting("overlay_screens") or "primary"
+        screens = QGuiApplication.screens()
+        if choice == "all":
+            return screens
+        if choice != "primary":
+            names = {choice} if isinstance(choice, str) else set(choice)
+            matching = [screen for screen in screens if screen.name() in names]
+            if matching:
+                return matching
+            self.logger.warning(f"No screen matches {choice}, using the primary screen")
+        primary = QGuiApplication.primaryScreen()
+        return [primary] if primary else []
+
+    def sync_screens(self):
+        targets = {screen.name(): screen for screen in self.target_screens()}
+        for name in list(self.overlays):
+            if name not in targets:
+                self.release_overlay(name)
+        for name, screen in targets.items():
+            overlay = self.overlays.get(name)
+            if overlay is None:
+                self.attach_overlay(name, screen)
+            elif overlay.target_screen is not screen:
+                overlay.set_target_screen(screen)
+                self.cache_screen(screen)
+
+    def attach_overlay(self, name, screen):
+        # Reuse a parked overlay before building a new widget
+        if self.spares:
+            overlay = self.spares.pop()
+            overlay.set_target_screen(screen)
+        else:
+            overlay = OverlayWindow(self.config, screen)
+            overlay.presented.connect(self.on_overlay_presented)
+            overlay.fade.finished.connect(self.on_overlay_fade_finished)
+        self.overlays[name] = overlay
+        self.watch_screen(screen)
+        self.cache_screen(screen)
+        overlay.prerender()
+        if self.shown:
+            overlay.fade_in()
+        self.logger.info(f"Overlay attached to screen {name}")
+
+    def release_overlay(self, name):
+        overlay = self.overlays.pop(name)
+        overlay.fade.stop()
+        overlay.hide()
+        overlay.target_screen = None
+        self.spares.append(overlay)
+        self.screen_cache.pop(name, None)
+        self.logger.info(f"Overlay detached from screen {name}")
+
+    def watch_screen(self, screen):
+        if screen in self.watched_screens:
+            return
+        self.watched_screens.add(screen)
+        screen.geometryChanged.connect(lambda geometry, s=screen: self.on_screen_changed(s))
+        screen.logicalDotsPerInchChanged.connect(lambda dpi, s=screen: self.on_screen_changed(s))
+        screen.physicalDotsPerInchChanged.connect(lambda dpi, s=screen: self.on_screen_changed(s))
+
+    def cache_screen(self, screen):
+        self.screen_cache[screen.name()] = (screen.geometry(), screen.devicePixelRatio())
+
+    def on_screen_added(self, screen):
+        self.logger.info(f"Screen added: {screen.name()}")
+        self.sync_screens()
+
+    def on_screen_removed(self, screen):
+        self.logger.info(f"Screen removed: {screen.name()}")
+        self.watched_screens.discard(screen)
+        overlay = self.overlays.get(screen.name())
+        if overlay is not None and overlay.target_screen is screen:
+            self.release_overlay(screen.name())
+        self.sync_screens()
+
+    def on_screen_changed(self, screen):
+        # Only the overlay on the affected screen reacts, and only as much
+        # as the change requires: a move for geometry, a re-render for DPR.
+        overlay = self.overlays.get(screen.name())
+        if overlay is None:
+            return
+        geometry = screen.geometry()
+        dpr = screen.devicePixelRatio()
+        cached = self.screen_cache.get(screen.name())
+        if cached and cached[0] == geometry and cached[1] == dpr:
+            return
+        if not cached or cached[0] != geometry:
+            overlay.center_on_screen()
+            self.logger.info(f"Screen {screen.name()} geometry changed, overlay re-centered")
+        if not cached or cached[1] != dpr:
+            overlay.prerender()
+            overlay.update()
+            self.logger.info(f"Screen {screen.name()} DPR changed to {dpr}, overlay re-rendered")
+        self.screen_cache[screen.name()] = (geometry, dpr)
+
+    def primary(self):
+        return next(iter(self.overlays.values()), None)
+
+    def device_pixel_ratios(self):
+        return {overlay.target_dpr() for overlay in self.overlays.values()}
+
+    def prerender(self):
+        for overlay in self.overlays.values():
+            overlay.prerender()
+
+    def apply_animation_settings(self):
+        for overlay in list(self.overlays.values()) + self.spares:
+            overlay.apply_animation_settings()
+
+    def apply_dynamic_settings(self):
+        for overlay in list(self.overlays.values()) + self.spares:
+            overlay.apply_dynamic_settings()
+
+    def apply_contrast_settings(self):
+        for overlay in list(self.overlays.values()) + self.spares:
+            overlay.apply_contrast_settings()
+
+    def set_spread(self, held):
+        for overlay in self.overlays.values():
+            overlay.dynamic.set_spread(held)
+
+    def trigger_hit_marker(self):
+        for overlay in self.overlays.values():
+            overlay.dynamic.trigger_hit_marker()
+
+    def is_shown(self):
+        return self.shown
+
+    def fade_in(self, pressed_at=None):
+        self.shown = True
+        self.pending_press = pressed_at
+        for overlay in self.overlays.values():
+            overlay.fade_in(pressed_at)
+
+    def fade_out(self):
+        self.shown = False
+        for overlay in self.overlays.values():
+            overlay.fade_out()
+
+    def hide(self):
+        self.shown = False
+        for overlay in self.overlays.values():
+            overlay.fade.stop()
+            overlay.hide()
+
+    def toggle_visible(self, pressed_at=None):
+        if self.shown:
+            self.fade_out()
+            return False
+        self.fade_in(pressed_at)
+        return True
+
+    def restart_fade(self):
+        self.hide()
+        self.fade_in()
+
+    def cross_fade_to(self, spec):
+        for overlay in self.overlays.values():
+            overlay.cross_fade_to(spec)
+
+    def on_overlay_presented(self, pressed_at):
+        # Report the first screen to show the crosshair for this press
+        if self.pending_press is not None and pressed_at == self.pending_press:
+            self.pending_press = None
+            self.presented.emit(pressed_at)
+
+    def on_overlay_fade_finished(self, stats):
+        primary = self.primary()
+        if primary is not None and self.sender() is primary.fade:
+            self.fade_finished.emit(stats)
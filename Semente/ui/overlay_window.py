@@ -1,11 +1,26 @@
+import time
+
 from PyQt5.QtWidgets import QWidget
-from PyQt5.QtCore import Qt, QPropertyAnimation, pyqtProperty
-from PyQt5.QtGui import QPainter, QColor, QPen
+from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtGui import QPainter, QColor
+from ui.adaptive_contrast import AdaptiveContrast
+from ui.crosshair_cache import crosshair_cache
+from ui.crosshair_renderer import CrosshairSpec, compile_crosshair
+from ui.crosshair_states import DynamicCrosshair
+from ui.fade_animator import FadeAnimator
+from utils.metrics import metrics
+
+_paint_timer = metrics.timer("overlay.paint_ms")
 
 class OverlayWindow(QWidget):
-    def __init__(self, config):
+    # Emitted after the first frame painted following fade_in(pressed_at),
+    # carrying the original time.perf_counter() press timestamp.
+    presented = pyqtSignal(float)
+
+    def __init__(self, config, screen=None):
         super().__init__()
         self.config = config
+        self.target_screen = screen
         self.setWindowFlags(
             Qt.WindowStaysOnTopHint |
             Qt.FramelessWindowHint |
@@ -16,35 +31,112 @@ class OverlayWindow(QWidget):
         self.setAttribute(Qt.WA_NoSystemBackground, True)
         self.setAttribute(Qt.WA_TransparentForMouseEvents, True)
 
-        self.opacity_value = 0.0
-        self.animation = QPropertyAnimation(self, b"windowOpacity")
-        self.animation.setDuration(800)  # 800 ms fade-in
-        self.animation.setStartValue(0.0)
-        self.animation.setEndValue(1.0)
-
-        self.resize(200, 200)
-        self.center_on_screen()
+        # Show/hide drive the window opacity; cross-fades blend two rasters
+        self.fade = FadeAnimator(self, self.setWindowOpacity)
+        self.cross_fade = FadeAnimator(self, self.set_cross_fade_progress)
+        self.hide_duration_ms = 150
+        self.apply_animation_settings()
+        self.fading_out = False
+        # Spread and hit-marker animations, idle unless enabled and triggered
+        self.dynamic = DynamicCrosshair(self, config)
+        # Background-dependent tint, idle unless enabled
+        self.contrast = AdaptiveContrast(self, config)
 
         self.crosshair_type = "Cross"
         self.color = QColor("#7F00FF")
         self.thickness = 2
         self.size = 20
         self.opacity = 0.8
+        # spec is what is painted: configured_spec, possibly re-tinted
+        self.spec = None
+        self.configured_spec = None
+        self.previous_spec = None
+        self.cross_fade_progress = 1.0
+        self.pending_press = None
 
         self.load_settings()
 
+    def apply_animation_settings(self):
+        animation = self.config.get_setting("animation") or {}
+        self.fade.duration_ms = animation.get("duration_ms", 800)
+        self.fade.easing = animation.get("easing", "OutCubic")
+        self.cross_fade.duration_ms = animation.get("cross_fade_ms", 250)
+        self.cross_fade.easing = animation.get("easing", "OutCubic")
+        self.hide_duration_ms = animation.get("hide_ms", 150)
+
     def load_settings(self):
-        crosshair = self.config.get_setting("crosshair")
-        if crosshair:
-            self.crosshair_type = crosshair.get("type", "Cross")
-            self.color = QColor(crosshair.get("color", "#7F00FF"))
-            self.thickness = crosshair.get("thickness", 2)
-            self.size = crosshair.get("size", 20)
-            self.opacity = crosshair.get("opacity", 0.8)
+        crosshair = self.config.crosshair
+        self.crosshair_type = crosshair.type
+        self.color = QColor(crosshair.color)
+        self.thickness = crosshair.thickness
+        self.size = crosshair.size
+        self.opacity = crosshair.opacity
+        self.apply_spec(CrosshairSpec.from_settings(crosshair))
         self.setWindowOpacity(self.opacity)
+        crosshair.subscribe(self.on_crosshair_changed)
+
+    def on_crosshair_changed(self, changes):
+        # Only the fields in changes are touched; the raster and geometry
+        # are reused whenever the resulting spec is unchanged.
+        if "type" in changes:
+            self.crosshair_type = changes["type"]
+        if "color" in changes:
+            self.color = QColor(changes["color"])
+        if "thickness" in changes:
+            self.thickness = changes["thickness"]
+        if "size" in changes:
+            self.size = changes["size"]
+        if "opacity" in changes:
+            self.opacity = changes["opacity"]
+            if self.isVisible() and not self.fade.is_running():
+                self.setWindowOpacity(self.opacity)
+        spec = CrosshairSpec.from_settings(self.config.crosshair)
+        if spec != self.configured_spec:
+            self.apply_spec(spec)
+
+    def apply_spec(self, spec, extent=None):
+        # The window is exactly as large as the crosshair raster, so the
+        # compositor only blends the pixels the crosshair can touch.
+        self.configured_spec = spec
+        spec = self.contrast.tint(spec)
+        self.spec = spec
+        compiled = compile_crosshair(spec)
+        extent = max(extent or compiled.extent, self.dynamic.extent(spec))
+        if self.width() != extent or self.height() != extent:
+            self.setFixedSize(extent, extent)
+            self.center_on_screen()
+        self.dynamic.spec_changed(spec, self.devicePixelRatioF())
+        self.update(compiled.centered_rect(self.width() // 2, self.height() // 2))
+
+    def apply_dynamic_settings(self):
+        self.dynamic.stop()
+        self.dynamic.apply_settings()
+        self.apply_spec(self.configured_spec)
+
+    def apply_contrast_settings(self):
+        self.contrast.stop()
+        self.contrast.apply_settings()
+        self.apply_spec(self.configured_spec)
+        self.contrast.start()
+
+    def retint(self):
+        # The adaptive color changed; the raster for it comes from the cache
+        self.apply_spec(self.configured_spec)
+
+    def set_target_screen(self, screen):
+        self.target_screen = screen
+        handle = self.windowHandle()
+        if handle is not None:
+            handle.setScreen(screen)
+        self.center_on_screen()
+
+    def target_dpr(self):
+        if self.target_screen is not None:
+            return self.target_screen.devicePixelRatio()
+        return self.devicePixelRatioF()
 
     def center_on_screen(self):
-        screen = self.screen()
+        screen = self.target_screen or self.screen()
         if screen:
             geometry = screen.geometry()
             x = geometry.x() + (geometry.width() - self.width()) // 2
@@ -52,42 +144,97 @@ class OverlayWindow(QWidget):
             self.move(x, y)
 
     def paintEvent(self, event):
+        started_at = time.perf_counter()
         painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
-        painter.setOpacity(self.opacity)
-        pen = QPen(self.color)
-        pen.setWidth(self.thickness)
-        painter.setPen(pen)
-
         center_x = self.width() // 2
         center_y = self.height() // 2
-        size = self.size
-
-        if self.crosshair_type == "Point":
-            painter.drawPoint(center_x, center_y)
-        elif self.crosshair_type == "Cross":
-            painter.drawLine(center_x - size, center_y, center_x + size, center_y)
-            painter.drawLine(center_x, center_y - size, center_x, center_y + size)
-        elif self.crosshair_type == "Circle":
-            painter.drawEllipse(center_x - size, center_y - size, size * 2, size * 2)
-        elif self.crosshair_type == "Square":
-            painter.drawRect(center_x - size, center_y - size, size * 2, size * 2)
-        else:
-            painter.drawLine(center_x - size, center_y, center_x + size, center_y)
-            painter.drawLine(center_x, center_y - size, center_x, center_y + size)
-
-    def fade_in(self):
-        self.animation.stop()
-        self.animation.setStartValue(0.0)
-        self.animation.setEndValue(self.opacity)
-        self.animation.start()
-        self.show()
+        dpr = self.devicePixelRatioF()
+        if self.previous_spec is not None:
+            painter.setOpacity(1.0 - self.cross_fade_progress)
+            crosshair_cache.draw_centered(painter, center_x, center_y, crosshair_cache.get(self.previous_spec, dpr))
+            painter.setOpacity(self.cross_fade_progress)
+        pixmap = self.dynamic.base_pixmap() or crosshair_cache.get(self.spec, dpr)
+        crosshair_cache.draw_centered(painter, center_x, center_y, pixmap)
+        self.dynamic.paint_over(painter, center_x, center_y)
+        painter.end()
+        _paint_timer.observe_since(started_at)
+        if self.pending_press is not None:
+            pressed_at = self.pending_press
+            self.pending_press = None
+            self.presented.emit(pressed_at)
 
-    def update_crosshair(self, crosshair_settings):
-        self.crosshair_type = crosshair_settings.get("type", self.crosshair_type)
-        self.color = QColor(crosshair_settings.get("color", self.color.name()))
-        self.thickness = crosshair_settings.get("thickness", self.thickness)
-        self.size = crosshair_settings.get("size", self.size)
-        self.opacity = crosshair_settings.get("opacity", self.opacity)
-        self.setWindowOpacity(self.opacity)
+    def prerender(self):
+        # Create the native window and warm the raster cache for the
+        # target screen's DPR while hidden
+        self.winId()
+        if self.target_screen is not None:
+            self.windowHandle().setScreen(self.target_screen)
+        crosshair_cache.get(self.spec, self.target_dpr())
+        self.dynamic.prepare(self.spec, self.target_dpr())
+
+    def fade_in(self, pressed_at=None):
+        self.pending_press = pressed_at
+        self.fading_out = False
+        if not self.isVisible():
+            self.setWindowOpacity(0.0)
+            self.fade.value = 0.0
+            self.show()
+        self.fade.start(self.fade.value, self.opacity, full_range=self.opacity)
+
+    def fade_out(self):
+        if not self.isVisible():
+            return
+        self.fading_out = True
+        duration_ms = self.fade.duration_ms
+        self.fade.duration_ms = self.hide_duration_ms
+        self.fade.start(self.windowOpacity(), 0.0, full_range=self.opacity, on_done=self.on_faded_out)
+        self.fade.duration_ms = duration_ms
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.contrast.start()
+
+    def hideEvent(self, event):
+        self.fading_out = False
+        self.dynamic.stop()
+        self.contrast.stop()
+        super().hideEvent(event)
+
+    def on_faded_out(self):
+        self.fading_out = False
+        self.hide()
+
+    def toggle_visible(self, pressed_at=None):
+        # Rapid toggles reverse the running fade from wherever it is
+        if self.isVisible() and not self.fading_out:
+            self.fade_out()
+            return False
+        self.fade_in(pressed_at)
+        return True
+
+    def cross_fade_to(self, spec):
+        if spec == self.configured_spec:
+            return
+        if not self.isVisible():
+            self.apply_spec(spec)
+            return
+        # An interrupted blend restarts from the spec that was fading in
+        self.previous_spec = self.spec
+        extent = max(compile_crosshair(spec).extent, compile_crosshair(self.previous_spec).extent)
+        self.cross_fade_progress = 0.0
+        self.apply_spec(spec, extent)
+        self.cross_fade.value = 0.0
+        self.cross_fade.start(0.0, 1.0, on_done=self.on_cross_fade_done)
+
+    def set_cross_fade_progress(self, progress):
+        self.cross_fade_progress = progress
         self.update()
+
+    def on_cross_fade_done(self):
+        self.previous_spec = None
+        self.cross_fade_progress = 1.0
+        self.apply_spec(self.configured_spec)
+
+    def update_crosshair(self, crosshair_settings):
+        # Apply a partial settings dict; the subscription above does the rest
+        self.config.crosshair.update(crosshair_settings)
@@ -0,0 +1,122 @@
+from collections import OrderedDict
+
+from PyQt5.QtCore import QAbstractListModel, QModelIndex, QSize, Qt, pyqtSignal
+from PyQt5.QtGui import QColor, QPixmap
+from PyQt5.QtWidgets import QListView, QVBoxLayout, QWidget
+
+from ui.thumbnail_loader import THUMBNAIL_BACKGROUND, ThumbnailLoader
+
+THUMBNAIL_SIZE = 64
+
+class PresetGalleryModel(QAbstractListModel):
+    # Lists every profile in the store. Thumbnails are requested only when
+    # the view asks for an item's icon, i.e. when it scrolls into sight; the
+    # profile itself is read and parsed by the same worker job.
+    def __init__(self, profile_store, loader, max_thumbnails=512, parent=None):
+        super().__init__(parent)
+        self.profile_store = profile_store
+        self.loader = loader
+        self.max_thumbnails = max_thumbnails
+        self.names = []
+        self.rows = {}
+        self.specs = {}
+        # Results of jobs started before the last reload are ignored
+        self.generation = 0
+        # name -> (spec key, pixmap), least recently shown first
+        self.thumbnails = OrderedDict()
+        self.failed = set()
+        self.placeholder = QPixmap(THUMBNAIL_SIZE, THUMBNAIL_SIZE)
+        self.placeholder.fill(QColor(THUMBNAIL_BACKGROUND))
+        loader.thumbnail_ready.connect(self.on_thumbnail_ready)
+
+    def reload(self):
+        self.beginResetModel()
+        self.loader.cancel_pending()
+        self.names = self.profile_store.names()
+        self.rows = {name: row for row, name in enumerate(self.names)}
+        self.generation += 1
+        self.specs.clear()
+        self.failed.clear()
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.names)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        name = self.names[index.row()]
+        if role in (Qt.DisplayRole, Qt.ToolTipRole):
+            return name
+        if role == Qt.DecorationRole:
+            return self.thumbnail_for(name)
+        return None
+
+    def thumbnail_for(self, name):
+        if name in self.failed:
+            return self.placeholder
+        spec = self.specs.get(name)
+        cached = self.thumbnails.get(name)
+        if cached is not None and spec is not None and cached[0] == spec.key:
+            self.thumbnails.move_to_end(name)
+            return cached[1]
+        key = (name, self.generation)
+        if spec is None:
+            # Parsed on the worker without touching the store's cache, which
+            # only the GUI thread changes
+            store = self.profile_store
+            self.loader.request(key, load=lambda: store.read(name))
+        else:
+            self.loader.request(key, spec)
+        return self.placeholder
+
+    def on_thumbnail_ready(self, key, spec, image):
+        name, generation = key
+        row = self.rows.get(name)
+        if generation != self.generation or row is None:
+            return
+        if spec is None:
+            self.failed.add(name)
+            return
+        self.specs[name] = spec
+        self.thumbnails[name] = (spec.key, QPixmap.fromImage(image))
+        self.thumbnails.move_to_end(name)
+        while len(self.thumbnails) > self.max_thumbnails:
+            self.thumbnails.popitem(last=False)
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [Qt.DecorationRole])
+
+class PresetGallery(QWidget):
+    preset_activated = pyqtSignal(str)
+
+    def __init__(self, profile_store, parent=None):
+        super().__init__(parent)
+        self.loader = ThumbnailLoader(size=THUMBNAIL_SIZE, dpr=self.devicePixelRatioF(), parent=self)
+        self.model = PresetGalleryModel(profile_store, self.loader, parent=self)
+
+        self.view = QListView()
+        self.view.setViewMode(QListView.IconMode)
+        self.view.setMovement(QListView.Static)
+        self.view.setResizeMode(QListView.Adjust)
+        # Lets the view lay out hundreds of items without asking each one
+        # for its size, so only visible items are ever queried
+        self.view.setUniformItemSizes(True)
+        self.view.setIconSize(QSize(THUMBNAIL_SIZE, THUMBNAIL_SIZE))
+        self.view.setGridSize(QSize(THUMBNAIL_SIZE + 32, THUMBNAIL_SIZE + 32))
+        self.view.setModel(self.model)
+        self.view.clicked.connect(self.on_clicked)
+
+        layout = QVBoxLayout()
+        layout.addWidget(self.view)
+        self.setLayout(layout)
+        self.model.reload()
+
+    def reload(self):
+        self.model.reload()
+
+    def on_clicked(self, index):
+        if index.isValid():
+            self.preset_activated.emit(self.model.names[index.row()])
+
+    def shutdown(self):
+        self.loader.shutdown()
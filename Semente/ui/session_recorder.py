@@ -0,0 +1,48 @@
+import json
+import logging
+import time
+
+from PyQt5.QtCore import QObject
+
+from utils.atomic_file import atomic_write_text
+
+SESSION_VERSION = 1
+
+class SessionRecorder(QObject):
+    # Records editor edits and hotkey actions as timestamped events that
+    # bench/session_replay.py can play back headless. Events stay in memory
+    # until save() so recording adds no disk I/O to the session itself.
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        self.started_at = time.perf_counter()
+        self.events = []
+        self.logger = logging.getLogger("Semente.SessionRecorder")
+
+    def attach_window(self, window):
+        window.field_edited.connect(self.on_field_edited)
+        window.profile_selected.connect(self.on_profile_selected)
+
+    def attach_hotkeys(self, hotkey_manager):
+        hotkey_manager.action_requested.connect(self.on_action)
+
+    def record(self, kind, at=None, **data):
+        at = time.perf_counter() if at is None else at
+        self.events.append({"t_ms": round((at - self.started_at) * 1000.0, 3), "kind": kind, **data})
+
+    def on_field_edited(self, field, value):
+        self.record("field", field=field, value=value)
+
+    def on_profile_selected(self, name):
+        self.record("profile", name=name)
+
+    def on_action(self, action, argument, pressed, pressed_at):
+        self.record("action", at=pressed_at, action=action, argument=argument, pressed=pressed)
+
+    def save(self):
+        data = {"version": SESSION_VERSION, "events": self.events}
+        try:
+            atomic_write_text(self.path, json.dumps(data, indent=1))
+            self.logger.info(f"Recorded {len(self.events)} events to {self.path}")
+        except Exception as e:
+            self.logger.error(f"Failed to save recorded session: {e}")
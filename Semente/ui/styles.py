@@ -0,0 +1,57 @@
+from PyQt5.QtWidgets import QApplication
+
+# Object name of the editor window; every rule below is scoped to it
+EDITOR_OBJECT_NAME = "SementeEditor"
+
+# One application-wide sheet: Qt parses it once, instead of once per widget
+# that carries its own sheet and again every time the editor is rebuilt.
+# The selectors only match the editor and widgets parented to it, as the
+# per-widget sheets did, so the tray menu and other windows keep their look.
+APP_STYLE_SHEET = """
+    QMainWindow#SementeEditor {
+        background-color: #0F0F0F;
+        color: white;
+        font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+    }
+    #SementeEditor QLabel {
+        color: #CCCCCC;
+        font-size: 14px;
+    }
+    #SementeEditor QComboBox, #SementeEditor QSlider,
+    #SementeEditor QPushButton, #SementeEditor QLineEdit {
+        background-color: #1C1C1C;
+        color: white;
+        border: 1px solid #7F00FF;
+        border-radius: 4px;
+    }
+    #SementeEditor QLineEdit[invalid="true"] {
+        border: 1px solid #FF4040;
+    }
+    #SementeEditor QSlider::handle:horizontal {
+        background: #7F00FF;
+        border-radius: 8px;
+        width: 16px;
+        margin: -4px 0;
+    }
+    #SementeEditor QPushButton:hover {
+        background-color: #7F00FF;
+        color: black;
+    }
+    #SementeEditor QTabBar::tab {
+        background: #1C1C1C;
+        color: #CCCCCC;
+        padding: 10px;
+        border-top-left-radius: 8px;
+        border-top-right-radius: 8px;
+        min-width: 100px;
+    }
+    #SementeEditor QTabBar::tab:selected {
+        background: #7F00FF;
+        color: white;
+    }
+"""
+
+def apply_app_style_sheet():
+    app = QApplication.instance()
+    if app is not None and app.styleSheet() != APP_STYLE_SHEET:
+        app.setStyleSheet(APP_STYLE_SHEET)
@@ -0,0 +1,141 @@
+import hashlib
+import logging
+import os
+import time
+
+from PyQt5.QtCore import QObject, QRectF, QRunnable, QThread, QThreadPool, pyqtSignal
+from PyQt5.QtGui import QColor, QImage, QPainter
+
+from ui.crosshair_renderer import CompiledCrosshair, CrosshairSpec
+from utils.metrics import metrics
+
+# Bump when the thumbnail look changes so stale files are not reused
+THUMBNAIL_CACHE_VERSION = 1
+THUMBNAIL_BACKGROUND = "#1C1C1C"
+
+_thumbnail_timer = metrics.timer("gallery.thumbnail_ms")
+_disk_hits = metrics.counter("gallery.thumbnail_disk_hits")
+_renders = metrics.counter("gallery.thumbnail_renders")
+
+def thumbnail_hash(spec, size, dpr=1.0):
+    raw = repr((THUMBNAIL_CACHE_VERSION, spec.key, size, round(float(dpr), 3)))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+def render_thumbnail(spec, size, dpr=1.0):
+    # Same raster as the editor preview, shrunk to fit when the crosshair is
+    # larger than the thumbnail. Only QImage is used, so this is safe off the
+    # GUI thread; the crosshair is compiled privately because the shared
+    # compile cache belongs to the GUI thread.
+    compiled = CompiledCrosshair(spec)
+    raster = compiled.render_image(dpr)
+    pixels = int(round(size * dpr))
+    image = QImage(pixels, pixels, QImage.Format_ARGB32_Premultiplied)
+    image.setDevicePixelRatio(dpr)
+    image.fill(QColor(THUMBNAIL_BACKGROUND))
+
+    painter = QPainter(image)
+    painter.setRenderHint(QPainter.SmoothPixmapTransform)
+    side = compiled.extent * min(1.0, size / compiled.extent)
+    offset = (size - side) / 2.0
+    painter.drawImage(QRectF(offset, offset, side, side), raster)
+    painter.end()
+    return image
+
+def thumbnail_path(directory, spec, size, dpr=1.0):
+    return os.path.join(directory, f"{thumbnail_hash(spec, size, dpr)}.png")
+
+class _ThumbnailJob(QRunnable):
+    # Either spec is given, or load() returns the crosshair settings to
+    # build it from; loading and parsing then happen here, off the GUI thread.
+    def __init__(self, loader, key, spec, load):
+        super().__init__()
+        self.loader = loader
+        self.key = key
+        self.spec = spec
+        self.load = load
+        self.directory = loader.directory
+        self.size = loader.size
+        self.dpr = loader.dpr
+
+    def run(self):
+        started_at = time.perf_counter()
+        spec = self.spec
+        image = QImage()
+        if spec is None:
+            try:
+                spec = CrosshairSpec.from_settings(self.load())
+            except Exception as e:
+                logging.getLogger("Semente.ThumbnailLoader").error(f"Failed to load preset {self.key}: {e}")
+        if spec is not None:
+            image = self.thumbnail(spec)
+            _thumbnail_timer.observe_since(started_at)
+        try:
+            self.loader.job_finished.emit(self.key, spec, image)
+        except RuntimeError:
+            # The loader was deleted while this job was running
+            pass
+
+    def thumbnail(self, spec):
+        path = thumbnail_path(self.directory, spec, self.size, self.dpr)
+        image = QImage(path) if os.path.exists(path) else QImage()
+        if image.isNull():
+            image = render_thumbnail(spec, self.size, self.dpr)
+            _renders.inc()
+            self.store(image, path)
+        else:
+            image.setDevicePixelRatio(self.dpr)
+            _disk_hits.inc()
+        return image
+
+    def store(self, image, path):
+        # Written under a temporary name so a reader never sees half a file
+        temp_path = f"{path}.{os.getpid()}.{id(self)}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            if image.save(temp_path, "PNG"):
+                os.replace(temp_path, path)
+        except OSError as e:
+            logging.getLogger("Semente.ThumbnailLoader").warning(f"Failed to cache thumbnail: {e}")
+
+class ThumbnailLoader(QObject):
+    # Renders crosshair thumbnails on a worker pool, backed by a PNG cache on
+    # disk keyed by a hash of the spec. Results arrive on the GUI thread as
+    # (key, spec, image); spec is None when load() failed.
+    thumbnail_ready = pyqtSignal(object, object, QImage)
+    job_finished = pyqtSignal(object, object, QImage)
+
+    def __init__(self, directory="cache/thumbnails", size=64, dpr=1.0, parent=None):
+        super().__init__(parent)
+        self.directory = directory
+        self.size = size
+        self.dpr = dpr
+        self.pending = set()
+        self.pool = QThreadPool(self)
+        # Leave a core for the GUI thread and the overlay
+        self.pool.setMaxThreadCount(max(1, QThread.idealThreadCount() - 1))
+        self.job_finished.connect(self.on_job_finished)
+        self.logger = logging.getLogger("Semente.ThumbnailLoader")
+
+    def path_for(self, spec):
+        return thumbnail_path(self.directory, spec, self.size, self.dpr)
+
+    def request(self, key, spec=None, load=None):
+        # Pass the spec, or a load() callable returning crosshair settings
+        if key in self.pending:
+            return
+        self.pending.add(key)
+        self.pool.start(_ThumbnailJob(self, key, spec, load))
+
+    def on_job_finished(self, key, spec, image):
+        if key in self.pending:
+            self.pending.discard(key)
+            self.thumbnail_ready.emit(key, spec, image)
+
+    def cancel_pending(self):
+        # Drops queued jobs; ones already running finish and are ignored
+        self.pool.clear()
+        self.pending.clear()
+
+    def shutdown(self, timeout_ms=1000):
+        self.cancel_pending()
+        self.pool.waitForDone(timeout_ms)
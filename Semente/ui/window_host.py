@@ -0,0 +1,115 @@
+import logging
+
+from PyQt5.QtCore import QCoreApplication, QEvent, QObject, Qt, QTimer, pyqtSignal
+
+from utils.process_stats import current_rss_bytes, format_bytes
+
+class MainWindowHost(QObject):
+    # Owns the editor window and builds it on first use, so startup does
+    # not pay for the editor when only the overlay is wanted. When
+    # "editor_idle_destroy_s" is set, a window left hidden that long is
+    # destroyed and rebuilt from the settings model on the next show().
+    toggle_requested = pyqtSignal()
+    # Emitted with every newly built MainWindow
+    window_built = pyqtSignal(object)
+
+    def __init__(self, config, profile_store=None):
+        super().__init__()
+        self.config = config
+        self.profile_store = profile_store
+        self.window = None
+        self.overlay = None
+        self.hotkey_manager = None
+        self.logger = logging.getLogger("Semente.MainWindowHost")
+        self.idle_timer = QTimer(self)
+        self.idle_timer.setSingleShot(True)
+        self.idle_timer.timeout.connect(self.on_idle_timeout)
+        # Callable from any thread, e.g. the tray's
+        self.toggle_requested.connect(self.toggle, Qt.QueuedConnection)
+
+    def get(self):
+        if self.window is None:
+            from ui.main_window import MainWindow
+            self.window = MainWindow(self.config, self.profile_store)
+            self.window.installEventFilter(self)
+            if self.overlay is not None:
+                self.window.set_overlay(self.overlay)
+            if self.hotkey_manager is not None:
+                self.window.set_hotkey_manager(self.hotkey_manager)
+            self.logger.info("Main window built")
+            self.window_built.emit(self.window)
+        return self.window
+
+    def set_overlay(self, overlay):
+        self.overlay = overlay
+        if self.window is not None:
+            self.window.set_overlay(overlay)
+
+    def set_hotkey_manager(self, hotkey_manager):
+        self.hotkey_manager = hotkey_manager
+        if self.window is not None:
+            self.window.set_hotkey_manager(hotkey_manager)
+
+    def refresh_settings(self):
+        # A window that does not exist yet reads the settings when built
+        if self.window is not None:
+            self.window.refresh_settings()
+
+    def isVisible(self):
+        return self.window is not None and self.window.isVisible()
+
+    def show(self):
+        window = self.get()
+        window.show()
+        window.raise_()
+        window.activateWindow()
+
+    def hide(self):
+        if self.window is not None:
+            self.window.hide()
+
+    def toggle(self):
+        if self.isVisible():
+            self.hide()
+        else:
+            self.show()
+
+    def eventFilter(self, watched, event):
+        # Arm the idle timer however the window gets hidden, including its
+        # own close button
+        if watched is self.window:
+            if event.type() == QEvent.Hide:
+                self.arm_idle_timer()
+            elif event.type() == QEvent.Show:
+                self.idle_timer.stop()
+        return False
+
+    def arm_idle_timer(self):
+        idle_s = self.config.get_setting("editor_idle_destroy_s")
+        if idle_s:
+            self.idle_timer.start(int(idle_s * 1000))
+
+    def on_idle_timeout(self):
+        if self.window is not None and not self.window.isVisible():
+            rss_before = current_rss_bytes()
+            self.destroy()
+            self.logger.info(
+                f"Idle main window destroyed: RSS {format_bytes(rss_before)}"
+                f" -> {format_bytes(current_rss_bytes())}"
+            )
+
+    def destroy(self):
+        # Free the editor entirely; the next show() builds it again from the
+        # settings model.
+        self.idle_timer.stop()
+        if self.window is None:
+            return False
+        window = self.window
+        self.window = None
+        window.removeEventFilter(self)
+        window.teardown()
+        window.hide()
+        window.deleteLater()
+        QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+        self.logger.info("Main window destroyed")
+        return True
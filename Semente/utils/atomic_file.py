@@ -0,0 +1,23 @@
+import os
+import tempfile
+
+def atomic_write_text(path, data):
+    # Write to a temp file in the same directory, then rename over the
+    # target so readers never observe a partially written file.
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    base = os.path.basename(path)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{base}-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    return len(data.encode("utf-8"))
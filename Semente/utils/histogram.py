@@ -0,0 +1,64 @@
+import bisect
+import math
+import threading
+
+class LatencyHistogram:
+    # Log-spaced buckets: constant memory and O(log n) recording no matter
+    # how many samples arrive, with ~5% relative error on percentiles.
+    def __init__(self, min_ms=0.01, max_ms=60000.0, growth=1.1):
+        self.bounds = []
+        bound = min_ms
+        while bound < max_ms:
+            self.bounds.append(bound)
+            bound *= growth
+        self.bounds.append(max_ms)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, value_ms):
+        index = bisect.bisect_left(self.bounds, value_ms)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.total += value_ms
+            if value_ms < self.min:
+                self.min = value_ms
+            if value_ms > self.max:
+                self.max = value_ms
+
+    def percentile(self, fraction):
+        with self._lock:
+            if not self.count:
+                return 0.0
+            rank = max(1, int(math.ceil(fraction * self.count)))
+            seen = 0
+            for index, bucket_count in enumerate(self.counts):
+                seen += bucket_count
+                if seen >= rank:
+                    if index >= len(self.bounds):
+                        return self.max
+                    return min(self.bounds[index], self.max)
+            return self.max
+
+    def reset(self):
+        with self._lock:
+            self.counts = [0] * (len(self.bounds) + 1)
+            self.count = 0
+            self.total = 0.0
+            self.min = math.inf
+            self.max = 0.0
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean_ms": self.total / self.count if self.count else 0.0,
+            "min_ms": self.min if self.count else 0.0,
+            "p50_ms": self.percentile(0.50),
+            "p90_ms": self.percentile(0.90),
+            "p99_ms": self.percentile(0.99),
+            "max_ms": self.max
+        }
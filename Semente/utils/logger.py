@@ -1,9 +1,42 @@
+import atexit
+import collections
 import logging
-import os
+import logging.handlers
+import queue
 
-def setup_logger(log_file="seemente.log"):
+_listener = None
+_ring_buffer = None
+
+class RingBufferHandler(logging.Handler):
+    # Keeps the most recent records in memory; formatting is deferred until
+    # someone actually asks for them.
+    def __init__(self, capacity=500):
+        super().__init__()
+        self.records = collections.deque(maxlen=capacity)
+
+    def emit(self, record):
+        self.records.append(record)
+
+    def formatted(self, limit=None):
+        records = list(self.records)
+        if limit is not None:
+            records = records[-limit:]
+        return [self.format(record) for record in records]
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    # The stock QueueHandler formats the message on the calling thread so
+    # records can be pickled. Records never leave the process here, so the
+    # formatting is left to the writer thread.
+    def prepare(self, record):
+        return record
+
+def setup_logger(log_file="seemente.log", level=logging.INFO, max_bytes=1024 * 1024,
+                 backup_count=3, ring_capacity=500):
+    global _listener, _ring_buffer
     logger = logging.getLogger("Semente")
-    logger.setLevel(logging.DEBUG)
+    logger.setLevel(level)
+    if _listener is not None:
+        return logger
 
     formatter = logging.Formatter(
         '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
@@ -14,13 +47,47 @@ def setup_logger(log_file="seemente.log"):
     ch.setLevel(logging.INFO)
     ch.setFormatter(formatter)
 
-    # File handler
-    fh = logging.FileHandler(log_file)
+    # Rotating file handler
+    fh = logging.handlers.RotatingFileHandler(
+        log_file, maxBytes=max_bytes, backupCount=backup_count, delay=True
+    )
     fh.setLevel(logging.DEBUG)
     fh.setFormatter(formatter)
 
-    if not logger.hasHandlers():
-        logger.addHandler(ch)
-        logger.addHandler(fh)
+    # In-memory buffer of recent records
+    _ring_buffer = RingBufferHandler(ring_capacity)
+    _ring_buffer.setFormatter(formatter)
+
+    # Callers only enqueue; a background thread does formatting and I/O
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(_DeferredQueueHandler(log_queue))
+    _listener = logging.handlers.QueueListener(
+        log_queue, ch, fh, _ring_buffer, respect_handler_level=True
+    )
+    _listener.start()
+    atexit.register(shutdown_logging)
 
     return logger
+
+def set_log_level(level):
+    # Accepts a logging level number or name such as "DEBUG"
+    if isinstance(level, str):
+        number = logging.getLevelName(level.upper())
+        if not isinstance(number, int):
+            raise ValueError(f"Unknown log level: {level}")
+        level = number
+    logging.getLogger("Semente").setLevel(level)
+
+def get_log_level():
+    return logging.getLevelName(logging.getLogger("Semente").level)
+
+def recent_records(limit=None):
+    if _ring_buffer is None:
+        return []
+    return _ring_buffer.formatted(limit)
+
+def shutdown_logging():
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,163 @@
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import logging
+import threading
+import time
+
+from utils.atomic_file import atomic_write_text
+from utils.histogram import LatencyHistogram
+
+class Counter:
+    # Incremented from worker threads too (e.g. the thumbnail pool)
+    __slots__ = ("name", "value", "lock")
+
+    def __init__(self, name):
+        self.name = name
+        self.value = 0
+        self.lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self.lock:
+            self.value += amount
+
+class Timer:
+    # A latency histogram; its sample count doubles as an event counter
+    __slots__ = ("name", "histogram")
+
+    def __init__(self, name):
+        self.name = name
+        self.histogram = LatencyHistogram()
+
+    def observe(self, value_ms):
+        self.histogram.record(value_ms)
+
+    def observe_since(self, started_at):
+        self.histogram.record((time.perf_counter() - started_at) * 1000.0)
+
+    @contextmanager
+    def time(self):
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe_since(started_at)
+
+class MetricsRegistry:
+    def __init__(self):
+        self.counters = {}
+        self.timers = {}
+        self.lock = threading.Lock()
+
+    def counter(self, name):
+        counter = self.counters.get(name)
+        if counter is None:
+            with self.lock:
+                counter = self.counters.setdefault(name, Counter(name))
+        return counter
+
+    def timer(self, name):
+        timer = self.timers.get(name)
+        if timer is None:
+            with self.lock:
+                timer = self.timers.setdefault(name, Timer(name))
+        return timer
+
+    def snapshot(self):
+        # Runs on the HTTP server thread while others register metrics
+        with self.lock:
+            counters = dict(self.counters)
+            timers = dict(self.timers)
+        return {
+            "counters": {name: counter.value for name, counter in sorted(counters.items())},
+            "timers": {name: timer.histogram.summary() for name, timer in sorted(timers.items())}
+        }
+
+    def render_text(self):
+        # Prometheus-style exposition, one metric per line
+        lines = []
+        snapshot = self.snapshot()
+        for name, value in snapshot["counters"].items():
+            lines.append(f"semente_{name.replace('.', '_')} {value}")
+        for name, summary in snapshot["timers"].items():
+            base = f"semente_{name.replace('.', '_')}"
+            lines.append(f"{base}_count {summary['count']}")
+            for key in ("mean_ms", "p50_ms", "p90_ms", "p99_ms", "max_ms"):
+                lines.append(f"{base}_{key} {summary[key]:.4f}")
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path, logger=None):
+        # Log the current metrics and write them to path
+        logger = logger or logging.getLogger("Semente.Metrics")
+        text = self.render_text()
+        logger.info("Metrics dump:\n" + text)
+        try:
+            atomic_write_text(path, text)
+            logger.info(f"Metrics written to {path}")
+        except Exception as e:
+            logger.error(f"Failed to write metrics dump: {e}")
+        return text
+
+# How often the endpoint's serving loop checks for a stop request
+SERVER_POLL_S = 0.1
+
+# Process-wide registry used by every instrumented component
+metrics = MetricsRegistry()
+
+class _MetricsRequestHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path in ("/", "/metrics"):
+            body = metrics.render_text().encode("utf-8")
+            content_type = "text/plain; version=0.0.4"
+        elif self.path == "/metrics.json":
+            body = json.dumps(metrics.snapshot(), indent=4).encode("utf-8")
+            content_type = "application/json"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class MetricsServer:
+    # Serves the registry on localhost only, from a daemon thread. stop()
+    # does not wait for the server to wind down, so it is cheap to call
+    # from the GUI thread, e.g. on every Game Ready Mode enter.
+    def __init__(self, port, host="127.0.0.1"):
+        self.host = host
+        self.port = port
+        self.server = None
+        self.thread = None
+        self.logger = logging.getLogger("Semente.MetricsServer")
+
+    def start(self):
+        if self.thread is not None:
+            # A server stopped just before still holds the port briefly
+            self.thread.join(timeout=1.0)
+            self.thread = None
+        try:
+            self.server = ThreadingHTTPServer((self.host, self.port), _MetricsRequestHandler)
+        except OSError as e:
+            self.logger.error(f"Failed to start metrics endpoint on {self.host}:{self.port}: {e}")
+            return False
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self._serve, args=(self.server,), name="SementeMetrics", daemon=True)
+        self.thread.start()
+        self.logger.info(f"Metrics available at http://{self.host}:{self.server.server_port}/metrics")
+        return True
+
+    def _serve(self, server):
+        server.serve_forever(poll_interval=SERVER_POLL_S)
+        server.server_close()
+
+    def stop(self):
+        if self.server is not None:
+            # shutdown() blocks until serve_forever notices, so it runs on
+            # a helper thread; _serve closes the socket once it returns
+            threading.Thread(target=self.server.shutdown, name="SementeMetricsStop", daemon=True).start()
+            self.server = None
@@ -0,0 +1,94 @@
+import os
+import sys
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# psutil.AccessDenied and friends are not OSErrors
+_PRIORITY_ERRORS = (OSError, AttributeError) + ((psutil.Error,) if psutil is not None else ())
+
+def peak_rss_bytes():
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is reported in bytes on macOS and kilobytes elsewhere
+        return peak if sys.platform == "darwin" else peak * 1024
+    if psutil is not None:
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss)
+    return None
+
+def current_rss_bytes():
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+def cpu_time_seconds():
+    times = os.times()
+    return times.user + times.system
+
+def format_bytes(value):
+    if value is None:
+        return "n/a"
+    return f"{value / (1024 * 1024):.1f} MiB"
+
+def lower_priority(original=None):
+    # Moves the process to a fixed lower priority derived from original
+    # (the current priority when None) and returns original for
+    # restore_priority(), or None when the priority could not be changed.
+    # Passing the original back in after a failed restore keeps repeated
+    # calls from lowering the priority any further.
+    try:
+        if psutil is not None:
+            process = psutil.Process()
+            current = process.nice()
+            if original is None:
+                original = current
+            if sys.platform == "win32":
+                if current != psutil.BELOW_NORMAL_PRIORITY_CLASS:
+                    process.nice(psutil.BELOW_NORMAL_PRIORITY_CLASS)
+            elif current < min(original + 5, 19):
+                process.nice(min(original + 5, 19))
+            return original
+        if hasattr(os, "getpriority"):
+            current = os.getpriority(os.PRIO_PROCESS, 0)
+            if original is None:
+                original = current
+            if current < min(original + 5, 19):
+                os.setpriority(os.PRIO_PROCESS, 0, min(original + 5, 19))
+            return original
+    except _PRIORITY_ERRORS:
+        pass
+    return None
+
+def restore_priority(previous):
+    # Raising the priority again can need privileges on POSIX
+    if previous is None:
+        return True
+    try:
+        if psutil is not None:
+            psutil.Process().nice(previous)
+        else:
+            os.setpriority(os.PRIO_PROCESS, 0, previous)
+        return True
+    except _PRIORITY_ERRORS:
+        return False
+
+def trim_heap():
+    # Hand freed heap pages back to the OS where the C library supports it
+    if sys.platform.startswith("linux"):
+        try:
+            import ctypes
+            ctypes.CDLL("libc.so.6").malloc_trim(0)
+        except (OSError, AttributeError):
+            pass
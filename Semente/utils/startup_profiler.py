@@ -0,0 +1,47 @@
+from contextlib import contextmanager
+import time
+
+from utils.process_stats import current_rss_bytes, format_bytes
+
+class StartupProfiler:
+    def __init__(self, enabled=False, started_at=None):
+        self.enabled = enabled
+        self.started_at = started_at if started_at is not None else time.perf_counter()
+        self.phases = []
+        self.marks = []
+
+    def _elapsed_ms(self):
+        return (time.perf_counter() - self.started_at) * 1000.0
+
+    @contextmanager
+    def phase(self, name):
+        if not self.enabled:
+            yield
+            return
+        rss_before = current_rss_bytes()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000.0
+            self.phases.append((name, duration_ms, self._elapsed_ms(), rss_before, current_rss_bytes()))
+
+    def mark(self, name):
+        if self.enabled:
+            self.marks.append((name, self._elapsed_ms(), current_rss_bytes()))
+
+    def report(self):
+        lines = ["Startup profile:"]
+        lines.append(f"  {'phase':<24}{'duration':>12}{'at':>12}{'rss before':>14}{'rss after':>14}")
+        for name, duration_ms, at_ms, rss_before, rss in self.phases:
+            lines.append(
+                f"  {name:<24}{duration_ms:>10.1f}ms{at_ms:>10.1f}ms"
+                f"{format_bytes(rss_before):>14}{format_bytes(rss):>14}"
+            )
+        for name, at_ms, rss in self.marks:
+            lines.append(f"  {name:<24}{'':>12}{at_ms:>10.1f}ms{'':>14}{format_bytes(rss):>14}")
+        return "\n".join(lines)
+
+    def print_report(self):
+        if self.enabled:
+            print(self.report(), flush=True)